@@ -4,7 +4,7 @@ Codebase Cartographer — Local Web App
 Usage: python cartographer.py /path/to/your/project [--port 3000]
 Opens an interactive dashboard in your browser.
 """
-import os, sys, json, re, hashlib, threading, webbrowser, time, subprocess, atexit
+import os, sys, json, re, hashlib, heapq, threading, webbrowser, time, subprocess, atexit
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
@@ -394,47 +394,69 @@ def load_project(path):
     }
 
 # ── DeepSeek Chat Functions ──
-def _select_relevant_files(query, scan_data, exclude_ids=[], max_files=10):
+_RELEVANCE_INDEX = {}  # {project_id: (nodes, [(node, name_lower, path_lower, concerns, boost), ...])}
+
+
+def _relevance_index(nodes, project_id=None):
+    """Query-independent relevance fields per node, cached per loaded project"""
+    cached = _RELEVANCE_INDEX.get(project_id)
+    if cached and cached[0] is nodes:
+        return cached[1]
+
+    entries = []
+    for node in nodes:
+        # Risk score boost (prefer high-risk files for analysis) + recent changes boost
+        boost = (2 if node['risk_score'] > 50 else 0) + (1 if node.get('git_changes', 0) > 5 else 0)
+        entries.append((node, node['name'].lower(), node['path'].lower(), node.get('concerns', []), boost))
+
+    # One slot per project: a rescan overwrites it and unloading the project pops it
+    if project_id is not None:
+        _RELEVANCE_INDEX[project_id] = (nodes, entries)
+    return entries
+
+
+def _select_relevant_files(query, scan_data, exclude_ids=[], max_files=10, project_id=None):
     """Select files by relevance scoring instead of simple matching"""
     query_lower = query.lower()
     query_words = set(query_lower.split())
+    excluded = set(exclude_ids)
 
     scored_files = []
 
-    for node in scan_data.get('nodes', []):
-        if node['id'] in exclude_ids:
+    for node, name_lower, path_lower, concerns, boost in _relevance_index(scan_data.get('nodes', ()), project_id):
+        if node['id'] in excluded:
             continue
 
-        score = 0
+        score = boost
 
         # File name match (high weight)
-        if any(word in node['name'].lower() for word in query_words):
+        if any(word in name_lower for word in query_words):
             score += 5
 
         # Path match (medium weight)
-        path_lower = node['path'].lower()
         if any(word in path_lower for word in query_words):
             score += 3
 
         # Concern match (high weight for domain relevance)
-        for concern in node.get('concerns', []):
+        for concern in concerns:
             if concern in query_lower:
                 score += 4
 
-        # Risk score boost (prefer high-risk files for analysis)
-        if node['risk_score'] > 50:
-            score += 2
-
-        # Recent changes boost
-        if node.get('git_changes', 0) > 5:
-            score += 1
-
         if score > 0:
             scored_files.append((node, score))
 
-    # Sort by score descending and return top N
-    scored_files.sort(key=lambda x: x[1], reverse=True)
-    return [node for node, score in scored_files[:max_files]]
+    # Top N by score descending (same order as a stable full sort)
+    return [node for node, score in heapq.nlargest(max_files, scored_files, key=lambda x: x[1])]
+
+
+_FILE_REF_RE = re.compile(r'`([^`]+)`')
+
+FOCUS_ACTIONS = {
+    'security': ['security', 'vulnerability', 'exploit', 'inject'],
+    'performance': ['performance', 'slow', 'optimize', 'speed'],
+    'refactor': ['refactor', 'improve', 'clean', 'reorganize'],
+    'bug': ['bug', 'error', 'issue', 'problem', 'fix']
+}
 
 
 def _extract_focus_areas(query, scan_data):
@@ -443,8 +465,7 @@ def _extract_focus_areas(query, scan_data):
     focus_areas = []
 
     # Check for specific file mentions
-    import re
-    file_refs = re.findall(r'`([^`]+)`', query)
+    file_refs = _FILE_REF_RE.findall(query)
     if file_refs:
         focus_areas.append(f"Files mentioned: {', '.join(file_refs)}")
 
@@ -454,14 +475,7 @@ def _extract_focus_areas(query, scan_data):
             focus_areas.append(f"Domain: {concern}")
 
     # Check for action keywords
-    actions = {
-        'security': ['security', 'vulnerability', 'exploit', 'inject'],
-        'performance': ['performance', 'slow', 'optimize', 'speed'],
-        'refactor': ['refactor', 'improve', 'clean', 'reorganize'],
-        'bug': ['bug', 'error', 'issue', 'problem', 'fix']
-    }
-
-    for action, keywords in actions.items():
+    for action, keywords in FOCUS_ACTIONS.items():
         if any(kw in query_lower for kw in keywords):
             focus_areas.append(f"Task: {action} analysis")
 
@@ -546,7 +560,8 @@ ARCHITECTURE & RISK MAP:
         query,
         SCAN_DATA,
         exclude_ids=top_files,
-        max_files=max_files - len(top_files)
+        max_files=max_files - len(top_files),
+        project_id=project_id
     )
 
     if relevant_files:
@@ -928,6 +943,7 @@ class Handler(BaseHTTPRequestHandler):
             project_id = data.get('project_id')
             if project_id in PROJECTS:
                 del PROJECTS[project_id]
+                _RELEVANCE_INDEX.pop(project_id, None)
                 if CURRENT_PROJECT_ID == project_id:
                     CURRENT_PROJECT_ID = list(PROJECTS.keys())[0] if PROJECTS else None
             self._json({'success': True})
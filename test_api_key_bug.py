@@ -1,15 +1,16 @@
 #!/usr/bin/env python3
 """Test script to reproduce the API key configuration bug"""
 
-# Simulate the global variable setup
-DEEPSEEK_API_KEY = ''
+# Simulate the module-level config state
+CONFIG = {"deepseek_api_key": ""}
 
 def call_deepseek_test():
     """Simulates call_deepseek function"""
-    print(f"[call_deepseek] DEEPSEEK_API_KEY value: '{DEEPSEEK_API_KEY}'")
-    print(f"[call_deepseek] Is empty? {not DEEPSEEK_API_KEY}")
+    api_key = CONFIG["deepseek_api_key"]
+    print(f"[call_deepseek] DEEPSEEK_API_KEY value: '{api_key}'")
+    print(f"[call_deepseek] Is empty? {not api_key}")
 
-    if not DEEPSEEK_API_KEY:
+    if not api_key:
         raise ValueError("DEEPSEEK_API_KEY not set")
 
     print("[call_deepseek] API key is set!")
@@ -17,13 +18,11 @@ def call_deepseek_test():
 
 def configure_api_key(new_key):
     """Simulates the /api/chat/config endpoint"""
-    global DEEPSEEK_API_KEY
-
     print(f"[configure] Received key: '{new_key}'")
 
     if new_key:
-        DEEPSEEK_API_KEY = new_key
-        print(f"[configure] Set DEEPSEEK_API_KEY to: '{DEEPSEEK_API_KEY}'")
+        CONFIG["deepseek_api_key"] = new_key
+        print(f"[configure] Set DEEPSEEK_API_KEY to: '{CONFIG['deepseek_api_key']}'")
 
     return {"success": True}
 
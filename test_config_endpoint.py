@@ -1,53 +1,66 @@
 #!/usr/bin/env python3
 """Test the config endpoint logic"""
 
-DEEPSEEK_API_KEY = ''
-SELECTED_MODEL = 'deepseek-chat'
+import io
+import re
+import sys
+from dataclasses import dataclass, replace
+from functools import lru_cache
 
-def test_config(data):
-    global DEEPSEEK_API_KEY, SELECTED_MODEL
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Stands in for the server's DEEPSEEK_API_KEY / SELECTED_MODEL globals"""
+    api_key: str = ''
+    model: str = 'deepseek-chat'
 
-    api_key = data.get('api_key', '').strip()
-    model = data.get('model', '')
+_HAS_NON_WHITESPACE = re.compile(r'\S').search
 
-    print(f"Received api_key: '{api_key}' (length: {len(api_key)})")
-    print(f"Received model: '{model}'")
+def _fast_strip(s: str) -> str:
+    """Strip only when an end character is whitespace, skipping the copy otherwise"""
+    if not s:
+        return s
+    # isspace() matches exactly what str.strip() removes, Unicode included
+    if not (s[0].isspace() or s[-1].isspace()):
+        return s
+    return s.strip()
 
-    if api_key:
-        DEEPSEEK_API_KEY = api_key
-        print(f"Updated DEEPSEEK_API_KEY to: '{DEEPSEEK_API_KEY}'")
-    else:
-        print("Did NOT update DEEPSEEK_API_KEY (api_key was empty/falsy)")
+@lru_cache(maxsize=256)
+def _validate(raw_api_key: str, model: str) -> tuple[str, str]:
+    """Normalize a (api_key, model) pair; repeated payloads hit the cache"""
+    # Whitespace-only keys are empty; only strip once we know the key is usable
+    api_key = _fast_strip(raw_api_key) if _HAS_NON_WHITESPACE(raw_api_key) else ''
+    return api_key, model
 
+def test_config(cfg: Config, data: dict, out=sys.stdout) -> tuple[Config, dict]:
+    """Apply a config payload to cfg, returning the updated Config and the response"""
+    api_key, model = _validate(data.get('api_key', ''), data.get('model', ''))
+
+    out.write("Received api_key: '%s' (length: %d)\nReceived model: '%s'\n"
+              % (api_key, len(api_key), model))
+
+    cfg = replace(cfg, api_key=api_key or cfg.api_key, model=model or cfg.model)
+
+    print(f"Updated DEEPSEEK_API_KEY to: '{cfg.api_key}'" if api_key
+          else "Did NOT update DEEPSEEK_API_KEY (api_key was empty/falsy)", file=out)
     if model:
-        SELECTED_MODEL = model
-        print(f"Updated SELECTED_MODEL to: '{SELECTED_MODEL}'")
-
-    print(f"\nFinal state:")
-    print(f"  DEEPSEEK_API_KEY: '{DEEPSEEK_API_KEY}'")
-    print(f"  SELECTED_MODEL: '{SELECTED_MODEL}'")
-
-    return {'success': True, 'model': SELECTED_MODEL}
-
-# Test 1: Valid API key
-print("=== TEST 1: Valid API key ===")
-result = test_config({'api_key': 'sk-valid-key', 'model': 'deepseek-chat'})
-print(f"Response: {result}\n")
-
-# Test 2: Empty string API key
-print("=== TEST 2: Empty string API key ===")
-DEEPSEEK_API_KEY = ''  # Reset
-result = test_config({'api_key': '', 'model': 'deepseek-chat'})
-print(f"Response: {result}\n")
-
-# Test 3: Whitespace only API key
-print("=== TEST 3: Whitespace only API key ===")
-DEEPSEEK_API_KEY = ''  # Reset
-result = test_config({'api_key': '   ', 'model': 'deepseek-chat'})
-print(f"Response: {result}\n")
-
-# Test 4: Missing api_key field
-print("=== TEST 4: Missing api_key field ===")
-DEEPSEEK_API_KEY = ''  # Reset
-result = test_config({'model': 'deepseek-chat'})
-print(f"Response: {result}\n")
+        print(f"Updated SELECTED_MODEL to: '{cfg.model}'", file=out)
+
+    out.write("\nFinal state:\n  DEEPSEEK_API_KEY: '%s'\n  SELECTED_MODEL: '%s'\n"
+              % (cfg.api_key, cfg.model))
+
+    return cfg, {'success': True, 'model': cfg.model}
+
+CASES = (
+    ("TEST 1: Valid API key", {'api_key': 'sk-valid-key', 'model': 'deepseek-chat'}),
+    ("TEST 2: Empty string API key", {'api_key': '', 'model': 'deepseek-chat'}),
+    ("TEST 3: Whitespace only API key", {'api_key': '   ', 'model': 'deepseek-chat'}),
+    ("TEST 4: Missing api_key field", {'model': 'deepseek-chat'}),
+)
+
+# Buffer all output and write it once at the end
+buf = io.StringIO()
+for title, payload in CASES:
+    print(f"=== {title} ===", file=buf)
+    cfg, result = test_config(Config(), payload, buf)
+    print(f"Response: {result}\n", file=buf)
+sys.stdout.write(buf.getvalue())
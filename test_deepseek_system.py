@@ -6,6 +6,7 @@ Comprehensive HTTP-based testing for DeepSeek optimizations with real API calls
 
 import os
 import sys
+import re
 import json
 import time
 import shutil
@@ -13,7 +14,15 @@ import requests
 import subprocess
 import tempfile
 from pathlib import Path
+from string import Template
+from types import MappingProxyType
 from datetime import datetime
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, str(Path(__file__).parent))
+from cartographer import estimate_tokens, _truncate_to_tokens, _extract_focus_areas, _select_relevant_files
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Configuration
@@ -34,47 +43,56 @@ class TestConfig:
     MULTI_LANG_PROJECT_NAME = "multi_lang_project"
 
 
+# Set CARTO_TEST_VERBOSE=0 to print only assertion failures
+_VERBOSE = os.environ.get('CARTO_TEST_VERBOSE', '1') != '0'
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Helper Functions
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+# Line prefix (icon plus separating space) for each print_test level
+_PRINT_PREFIXES = {
+    "INFO": "ℹ️  ",
+    "PASS": "✅ ",
+    "FAIL": "❌ ",
+    "WARN": "⚠️  ",
+    "SECTION": "\n═══ ",
+}
+
+
 def print_test(message, level="INFO"):
     """Print test message with formatting"""
-    icons = {
-        "INFO": "ℹ️ ",
-        "PASS": "✅",
-        "FAIL": "❌",
-        "WARN": "⚠️ ",
-        "SECTION": "\n═══",
-    }
-    icon = icons.get(level, "  ")
-    print(f"{icon} {message}")
+    print(f"{_PRINT_PREFIXES.get(level, '   ')}{message}")
 
 
 def assert_status(response, expected_code, test_name):
     """Assert HTTP status code"""
     if response.status_code == expected_code:
-        print_test(f"{test_name}: Status {expected_code}", "PASS")
+        if _VERBOSE:
+            print_test(f"{test_name}: Status {expected_code}", "PASS")
         return True
     else:
         print_test(f"{test_name}: Expected {expected_code}, got {response.status_code}", "FAIL")
         return False
 
 
-def assert_contains(text, substring, message):
-    """Assert substring is in text"""
-    if substring.lower() in text.lower():
-        print_test(f"{message}", "PASS")
+def assert_contains(text_lower, substring_lower, message):
+    """Assert substring is in text (both already lower-cased by the caller)"""
+    if substring_lower in text_lower:
+        if _VERBOSE:
+            print_test(f"{message}", "PASS")
         return True
     else:
-        print_test(f"{message} ('{substring}' not found)", "FAIL")
+        print_test(f"{message} ('{substring_lower}' not found)", "FAIL")
         return False
 
 
 def assert_equal(actual, expected, message):
     """Assert values are equal"""
     if actual == expected:
-        print_test(f"{message}", "PASS")
+        if _VERBOSE:
+            print_test(f"{message}", "PASS")
         return True
     else:
         print_test(f"{message} (expected {expected}, got {actual})", "FAIL")
@@ -84,7 +102,8 @@ def assert_equal(actual, expected, message):
 def assert_greater(actual, threshold, message):
     """Assert value is greater than threshold"""
     if actual > threshold:
-        print_test(f"{message} (value: {actual})", "PASS")
+        if _VERBOSE:
+            print_test(f"{message} (value: {actual})", "PASS")
         return True
     else:
         print_test(f"{message} (value {actual} not > {threshold})", "FAIL")
@@ -94,7 +113,8 @@ def assert_greater(actual, threshold, message):
 def assert_less(actual, threshold, message):
     """Assert value is less than threshold"""
     if actual < threshold:
-        print_test(f"{message} (value: {actual})", "PASS")
+        if _VERBOSE:
+            print_test(f"{message} (value: {actual})", "PASS")
         return True
     else:
         print_test(f"{message} (value {actual} not < {threshold})", "FAIL")
@@ -104,13 +124,28 @@ def assert_less(actual, threshold, message):
 def assert_in_list(value, valid_values, message):
     """Assert value is in list of valid values"""
     if value in valid_values:
-        print_test(f"{message}", "PASS")
+        if _VERBOSE:
+            print_test(f"{message}", "PASS")
         return True
     else:
         print_test(f"{message} (got {value}, expected one of {valid_values})", "FAIL")
         return False
 
 
+def requires_api_key(test_name):
+    """Skip a TestSuite test (recorded as passed) without a real API key; else run it with test_name"""
+    def decorator(test):
+        @wraps(test)
+        def wrapper(self):
+            if not self.runner.api_key or self.runner.api_key == 'test-mock-key':
+                print_test(f"{test_name}: Skipped (no API key)", "WARN")
+                self.runner.record_test(test_name, True, 0.0)
+                return
+            return test(self, test_name)
+        return wrapper
+    return decorator
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Test Infrastructure
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -126,6 +161,10 @@ class DeepSeekTestRunner:
         self.test_projects = []
         self.project_ids = {}
 
+        # Pooled keep-alive connections to the local test server
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0))
+
         # Metrics collection
         self.metrics = {
             'tests': [],
@@ -153,9 +192,9 @@ class DeepSeekTestRunner:
             [sys.executable, 'cartographer.py', '--port', str(self.port)],
             cwd=Path(__file__).parent,
             env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            # Server logs are never read; an undrained PIPE would eventually block the server
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
         )
 
         # Wait for server to be ready
@@ -164,20 +203,23 @@ class DeepSeekTestRunner:
     def _health_check(self):
         """Verify server is responsive"""
         print_test("Waiting for server to be ready...", "INFO")
+        delay = 0.05
         for attempt in range(30):
             try:
-                response = requests.get(f"{self.base_url}/api/projects", timeout=2)
+                response = self.session.get(f"{self.base_url}/api/projects", timeout=0.5)
                 if response.status_code == 200:
                     print_test("Test server ready", "PASS")
                     return True
             except requests.exceptions.RequestException:
-                time.sleep(1)
+                time.sleep(delay)
+                delay = min(delay * 1.5, 1.0)
 
         print_test("Server failed to start", "FAIL")
         raise RuntimeError("Server failed to start")
 
     def stop_server(self):
         """Stop server and cleanup"""
+        self.session.close()
         if self.server_process:
             print_test("Stopping test server...", "INFO")
             self.server_process.terminate()
@@ -220,6 +262,44 @@ class DeepSeekTestRunner:
         })
 
 
+# Source for each large-project module, filled in per module index
+_LARGE_SERVICE_TEMPLATE = Template('''
+# Service module $i - Risk level: $risk_level
+import os
+import requests
+
+class Service$i:
+    """Service for handling module $i operations"""
+
+    def __init__(self):
+        self.api_key = os.getenv('API_KEY_$i')
+        self.endpoint = 'https://api.example.com/v1/module_$i'
+
+    def process_data(self, data):
+        """Process data for module $i"""
+        # Simulate processing
+        result = {
+            'module': $i,
+            'processed': True,
+            'data': data,
+            'risk_level': '$risk_level'
+        }
+        return result
+
+    def make_api_call(self, payload):
+        """Make API call for module $i"""
+        headers = {'Authorization': f'Bearer {self.api_key}'}
+        response = requests.post(self.endpoint, json=payload, headers=headers)
+        return response.json()
+
+    def validate_input(self, input_data):
+        """Validate input for module $i"""
+        if not input_data:
+            raise ValueError("Input cannot be empty")
+        return True
+''' * 2)  # Make it longer
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Test Project Generator
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -231,12 +311,14 @@ class TestProjectGenerator:
     def _create_files(project_path, files):
         """Helper to write files to disk"""
         project_path = Path(project_path)
-        project_path.mkdir(parents=True, exist_ok=True)
+        file_paths = {project_path / file_rel_path: content for file_rel_path, content in files.items()}
 
-        for file_rel_path, content in files.items():
-            file_path = project_path / file_rel_path
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(content.strip())
+        # Create each directory once rather than once per file
+        for directory in {project_path, *(file_path.parent for file_path in file_paths)}:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        for file_path, content in file_paths.items():
+            file_path.write_bytes(content.strip().encode('utf-8'))
 
         return str(project_path)
 
@@ -349,42 +431,7 @@ def test_missing_user():
         # Generate multiple modules with varying content and risk
         for i in range(num_files):
             risk_level = "high" if i % 5 == 0 else "medium" if i % 3 == 0 else "low"
-
-            files[f'module_{i}/service.py'] = f'''
-# Service module {i} - Risk level: {risk_level}
-import os
-import requests
-
-class Service{i}:
-    """Service for handling module {i} operations"""
-
-    def __init__(self):
-        self.api_key = os.getenv('API_KEY_{i}')
-        self.endpoint = 'https://api.example.com/v1/module_{i}'
-
-    def process_data(self, data):
-        """Process data for module {i}"""
-        # Simulate processing
-        result = {{
-            'module': {i},
-            'processed': True,
-            'data': data,
-            'risk_level': '{risk_level}'
-        }}
-        return result
-
-    def make_api_call(self, payload):
-        """Make API call for module {i}"""
-        headers = {{'Authorization': f'Bearer {{self.api_key}}'}}
-        response = requests.post(self.endpoint, json=payload, headers=headers)
-        return response.json()
-
-    def validate_input(self, input_data):
-        """Validate input for module {i}"""
-        if not input_data:
-            raise ValueError("Input cannot be empty")
-        return True
-''' * 2  # Make it longer
+            files[f'module_{i}/service.py'] = _LARGE_SERVICE_TEMPLATE.substitute(i=i, risk_level=risk_level)
 
         return TestProjectGenerator._create_files(project_path, files)
 
@@ -483,6 +530,82 @@ func (c *Cache) Get(key string) (interface{}, bool) {
         return TestProjectGenerator._create_files(project_path, files)
 
 
+# Case-insensitive security wording check for response quality metrics (one scan, no lower() copy)
+_SECURITY_TERMS_RE = re.compile(r'security|vulnerability', re.IGNORECASE)
+
+# Mock scan data for the relevance scoring tests (read-only, built once)
+_FIXTURE_AUTH_NODES = MappingProxyType({
+    'nodes': [
+        {
+            'id': 'auth1',
+            'name': 'login.py',
+            'path': '/auth/login.py',
+            'risk_score': 75,
+            'git_changes': 10,
+            'concerns': ['authentication', 'security']
+        },
+        {
+            'id': 'util1',
+            'name': 'utils.py',
+            'path': '/utils.py',
+            'risk_score': 20,
+            'git_changes': 2,
+            'concerns': []
+        },
+        {
+            'id': 'auth2',
+            'name': 'session.py',
+            'path': '/auth/session.py',
+            'risk_score': 60,
+            'git_changes': 5,
+            'concerns': ['authentication']
+        }
+    ]
+})
+
+_FIXTURE_RISK_NODES = MappingProxyType({
+    'nodes': [
+        {
+            'id': 'low',
+            'name': 'low.py',
+            'path': '/low.py',
+            'risk_score': 20,
+            'git_changes': 0,
+            'concerns': ['test']
+        },
+        {
+            'id': 'high',
+            'name': 'high.py',
+            'path': '/high.py',
+            'risk_score': 85,
+            'git_changes': 0,
+            'concerns': ['test']
+        }
+    ]
+})
+
+_FIXTURE_RECENT_NODES = MappingProxyType({
+    'nodes': [
+        {
+            'id': 'old',
+            'name': 'old.py',
+            'path': '/old.py',
+            'risk_score': 50,
+            'git_changes': 1,
+            'concerns': ['api']
+        },
+        {
+            'id': 'recent',
+            'name': 'recent.py',
+            'path': '/recent.py',
+            'risk_score': 50,
+            'git_changes': 15,
+            'concerns': ['api']
+        }
+    ]
+})
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Test Functions
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -495,15 +618,29 @@ class TestSuite:
         self.auth_project_id = None
         self.large_project_id = None
         self.multi_lang_project_id = None
+        self._chat_url = f"{runner.base_url}/api/chat"
+
+    def _post_chat(self, message, project_id, model=None, include_files=None):
+        """POST a chat message to the test server"""
+        body = {'message': message, 'project_id': project_id}
+        if model:
+            body['model'] = model
+        if include_files:
+            body['include_files'] = include_files
+        return self.runner.session.post(self._chat_url, json=body, timeout=TestConfig.API_TIMEOUT)
 
     def setup(self):
         """Setup test environment"""
         print_test("Setting up test environment...", "INFO")
 
-        # Create test projects
-        auth_project_path = TestProjectGenerator.create_auth_project(TestConfig.TEST_PROJECT_DIR)
-        large_project_path = TestProjectGenerator.create_large_project(TestConfig.TEST_PROJECT_DIR, num_files=50)
-        multi_lang_path = TestProjectGenerator.create_multi_language_project(TestConfig.TEST_PROJECT_DIR)
+        # Create test projects (independent directories, so write them in parallel)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            auth_future = pool.submit(TestProjectGenerator.create_auth_project, TestConfig.TEST_PROJECT_DIR)
+            large_future = pool.submit(TestProjectGenerator.create_large_project, TestConfig.TEST_PROJECT_DIR, num_files=50)
+            multi_lang_future = pool.submit(TestProjectGenerator.create_multi_language_project, TestConfig.TEST_PROJECT_DIR)
+        auth_project_path = auth_future.result()
+        large_project_path = large_future.result()
+        multi_lang_path = multi_lang_future.result()
 
         print_test(f"Created auth project: {auth_project_path}", "INFO")
         print_test(f"Created large project: {large_project_path}", "INFO")
@@ -511,7 +648,7 @@ class TestSuite:
 
         # Load projects
         try:
-            response = requests.post(
+            response = self.runner.session.post(
                 f"{self.runner.base_url}/api/load-project",
                 json={'path': auth_project_path},
                 timeout=TestConfig.API_TIMEOUT
@@ -523,24 +660,33 @@ class TestSuite:
         except Exception as e:
             print_test(f"Failed to load auth project: {e}", "FAIL")
 
+        try:
+            response = self.runner.session.post(
+                f"{self.runner.base_url}/api/load-project",
+                json={'path': large_project_path},
+                timeout=TestConfig.API_TIMEOUT
+            )
+            if response.status_code == 200:
+                self.large_project_id = response.json()['project_id']
+                self.runner.project_ids['large'] = self.large_project_id
+                print_test(f"Loaded large project: {self.large_project_id}", "PASS")
+        except Exception as e:
+            print_test(f"Failed to load large project: {e}", "FAIL")
+
     # ───────────────────────────────────────────────────────────────────
     # PHASE 1: Model Configuration Tests
     # ───────────────────────────────────────────────────────────────────
 
     def test_1_1_default_model_is_coder(self):
         """Test 1.1: Verify default model is deepseek-coder"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "1.1: Default model is deepseek-coder"
 
         try:
             # Send chat without specifying model
-            response = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'What files exist?',
-                    'project_id': self.auth_project_id
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response = self._post_chat(
+                'What files exist?',
+                self.auth_project_id
             )
 
             passed = assert_status(response, 200, test_name)
@@ -552,27 +698,23 @@ class TestSuite:
                     print_test("Response missing 'model' field - assuming default", "WARN")
                     passed = True
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_1_2_model_switching(self):
         """Test 1.2: Test switching between coder/reasoner/chat models"""
         models_to_test = ['deepseek-coder', 'deepseek-reasoner', 'deepseek-chat']
 
         for model in models_to_test:
-            start = time.time()
+            start = time.perf_counter()
             test_name = f"1.2: Model switching to {model}"
 
             try:
-                response = requests.post(
-                    f"{self.runner.base_url}/api/chat",
-                    json={
-                        'message': 'Analyze authentication',
-                        'project_id': self.auth_project_id,
-                        'model': model
-                    },
-                    timeout=TestConfig.API_TIMEOUT
+                response = self._post_chat(
+                    'Analyze authentication',
+                    self.auth_project_id,
+                    model=model
                 )
 
                 passed = assert_status(response, 200, test_name)
@@ -587,21 +729,21 @@ class TestSuite:
                             model=model,
                             context_size=data.get('context_size', 0),
                             tokens_used=len(data['response']) // 4,
-                            response_time=response.elapsed.total_seconds()
+                            response_time=time.perf_counter() - start
                         )
 
-                self.runner.record_test(test_name, passed, time.time() - start)
+                self.runner.record_test(test_name, passed, time.perf_counter() - start)
             except Exception as e:
-                self.runner.record_test(test_name, False, time.time() - start, str(e))
+                self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_1_3_model_persistence(self):
         """Test 1.3: Test model selection persists to config"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "1.3: Model persistence in config"
 
         try:
             # Configure via API
-            response = requests.post(
+            response = self.runner.session.post(
                 f"{self.runner.base_url}/api/chat/config",
                 json={
                     'api_key': self.runner.api_key,
@@ -619,13 +761,13 @@ class TestSuite:
                 # Verify config file
                 config_path = Path.home() / '.cartographer_config.json'
                 if config_path.exists():
-                    config = json.loads(config_path.read_text())
+                    config = json.loads(config_path.read_bytes())
                     if 'model' in config:
                         passed = assert_equal(config['model'], 'deepseek-reasoner', "Config file should have reasoner") and passed
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # PHASE 2: Token Limit Tests
@@ -633,14 +775,10 @@ class TestSuite:
 
     def test_2_1_token_estimation(self):
         """Test 2.1: Verify token estimation utility accuracy"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "2.1: Token estimation"
 
         try:
-            # Import functions from cartographer
-            sys.path.insert(0, str(Path(__file__).parent))
-            from cartographer import estimate_tokens, _truncate_to_tokens
-
             # Test known text sizes
             text_1k = 'a' * 1000
             tokens_1k = estimate_tokens(text_1k)
@@ -650,55 +788,40 @@ class TestSuite:
             tokens_10k = estimate_tokens(text_10k)
             passed = assert_equal(tokens_10k, 2500, "10000 chars should be ~2500 tokens") and passed
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_2_2_token_truncation(self):
         """Test 2.2: Verify truncation doesn't exceed limits"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "2.2: Token truncation"
 
         try:
-            from cartographer import estimate_tokens, _truncate_to_tokens
-
-            large_text = 'x' * 1_000_000  # 1M chars = ~250K tokens
+            large_text = 'x' * 500_000  # 500K chars = ~125K tokens, just over the 120K limit
             truncated = _truncate_to_tokens(large_text, max_tokens=120000)
             estimated = estimate_tokens(truncated)
 
             passed = assert_less(estimated, 120001, "Truncated text should be within token limit")
             passed = assert_equal(len(truncated), 480000, "120K tokens * 4 = 480K chars") and passed
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_2_3_context_size_increased(self):
         """Test 2.3: Verify context size is much larger than before"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "2.3: Context size increased"
 
         try:
-            # Load large project first
-            large_project_path = TestConfig.TEST_PROJECT_DIR / TestConfig.LARGE_PROJECT_NAME
-            response = requests.post(
-                f"{self.runner.base_url}/api/load-project",
-                json={'path': str(large_project_path)},
-                timeout=TestConfig.API_TIMEOUT
-            )
-
-            if response.status_code == 200:
-                large_project_id = response.json()['project_id']
-
+            # Large project was loaded once in setup()
+            if self.large_project_id:
                 # Send broad query
-                response = requests.post(
-                    f"{self.runner.base_url}/api/chat",
-                    json={
-                        'message': 'Give comprehensive overview of entire codebase',
-                        'project_id': large_project_id,
-                        'model': 'deepseek-coder'
-                    },
-                    timeout=TestConfig.API_TIMEOUT
+                response = self._post_chat(
+                    'Give comprehensive overview of entire codebase',
+                    self.large_project_id,
+                    model='deepseek-coder'
                 )
 
                 passed = assert_status(response, 200, test_name)
@@ -712,9 +835,9 @@ class TestSuite:
             else:
                 passed = False
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_2_4_token_limits_per_model(self):
         """Test 2.4: Verify different models respect their token limits"""
@@ -725,19 +848,15 @@ class TestSuite:
         }
 
         for model, expected_limit in limits.items():
-            start = time.time()
+            start = time.perf_counter()
             test_name = f"2.4: Token limit for {model}"
 
             try:
                 # Send query with large project
-                response = requests.post(
-                    f"{self.runner.base_url}/api/chat",
-                    json={
-                        'message': 'Analyze everything in detail',
-                        'project_id': self.auth_project_id,
-                        'model': model
-                    },
-                    timeout=TestConfig.API_TIMEOUT
+                response = self._post_chat(
+                    'Analyze everything in detail',
+                    self.auth_project_id,
+                    model=model
                 )
 
                 passed = assert_status(response, 200, test_name)
@@ -746,16 +865,15 @@ class TestSuite:
                     context_size = data.get('context_size', 0)
 
                     # Estimate tokens
-                    from cartographer import estimate_tokens
                     context_tokens = estimate_tokens(context_size) if isinstance(context_size, str) else context_size // 4
 
                     # Context should respect model's token limit (with buffer for response)
                     max_context = expected_limit - 10000  # Leave room for response
                     passed = assert_less(context_tokens, max_context, f"Context should respect {model} limit")
 
-                self.runner.record_test(test_name, passed, time.time() - start)
+                self.runner.record_test(test_name, passed, time.perf_counter() - start)
             except Exception as e:
-                self.runner.record_test(test_name, False, time.time() - start, str(e))
+                self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # PHASE 3: Strategic Context Placement Tests
@@ -763,18 +881,14 @@ class TestSuite:
 
     def test_3_1_query_in_response(self):
         """Test 3.1: Verify query terms appear in AI response (top section effectiveness)"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "3.1: Query terms in response"
 
         try:
-            response = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'Find SQL injection vulnerabilities in authentication',
-                    'project_id': self.auth_project_id,
-                    'model': 'deepseek-coder'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response = self._post_chat(
+                'Find SQL injection vulnerabilities in authentication',
+                self.auth_project_id,
+                model='deepseek-coder'
             )
 
             passed = assert_status(response, 200, test_name)
@@ -792,42 +906,40 @@ class TestSuite:
                 else:
                     print_test("Response missing query terms", "FAIL")
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_3_2_focus_extraction(self):
         """Test 3.2: Verify focus areas are extracted from query"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "3.2: Focus area extraction"
 
         try:
-            from cartographer import _extract_focus_areas
-
             scan_data = {'nodes': []}
 
             # Test security focus
             query = "Find security vulnerabilities"
-            focus = _extract_focus_areas(query, scan_data)
+            focus = _extract_focus_areas(query, scan_data).lower()
             passed = assert_contains(focus, 'security', "Should detect security focus")
 
             # Test domain detection
             query = "Analyze authentication and database patterns"
-            focus = _extract_focus_areas(query, scan_data)
+            focus = _extract_focus_areas(query, scan_data).lower()
             passed = assert_contains(focus, 'authentication', "Should detect authentication domain") and passed
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_3_3_explicitly_requested_files(self):
         """Test 3.3: Verify include_files appear in response"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "3.3: Explicitly requested files"
 
         try:
             # Get scan data to extract file ID
-            response = requests.get(
+            response = self.runner.session.get(
                 f"{self.runner.base_url}/api/scan",
                 params={'project_id': self.auth_project_id},
                 timeout=TestConfig.API_TIMEOUT
@@ -840,15 +952,11 @@ class TestSuite:
                     file_name = scan_data['nodes'][0]['name']
 
                     # Request specific file
-                    response = requests.post(
-                        f"{self.runner.base_url}/api/chat",
-                        json={
-                            'message': 'Review this file for issues',
-                            'project_id': self.auth_project_id,
-                            'include_files': [f"{self.auth_project_id}:{file_id}"],
-                            'model': 'deepseek-coder'
-                        },
-                        timeout=TestConfig.API_TIMEOUT
+                    response = self._post_chat(
+                        'Review this file for issues',
+                        self.auth_project_id,
+                        model='deepseek-coder',
+                        include_files=[f"{self.auth_project_id}:{file_id}"]
                     )
 
                     passed = assert_status(response, 200, test_name)
@@ -863,9 +971,9 @@ class TestSuite:
             else:
                 passed = False
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # PHASE 4: Relevance Scoring Tests
@@ -873,41 +981,11 @@ class TestSuite:
 
     def test_4_1_relevance_prioritizes_auth(self):
         """Test 4.1: Verify auth files are prioritized for auth query"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "4.1: Relevance scoring prioritizes auth files"
 
         try:
-            from cartographer import _select_relevant_files
-
-            # Create mock scan data
-            scan_data = {
-                'nodes': [
-                    {
-                        'id': 'auth1',
-                        'name': 'login.py',
-                        'path': '/auth/login.py',
-                        'risk_score': 75,
-                        'git_changes': 10,
-                        'concerns': ['authentication', 'security']
-                    },
-                    {
-                        'id': 'util1',
-                        'name': 'utils.py',
-                        'path': '/utils.py',
-                        'risk_score': 20,
-                        'git_changes': 2,
-                        'concerns': []
-                    },
-                    {
-                        'id': 'auth2',
-                        'name': 'session.py',
-                        'path': '/auth/session.py',
-                        'risk_score': 60,
-                        'git_changes': 5,
-                        'concerns': ['authentication']
-                    }
-                ]
-            }
+            scan_data = _FIXTURE_AUTH_NODES
 
             query = "authentication security"
             files = _select_relevant_files(query, scan_data, max_files=10)
@@ -916,38 +994,17 @@ class TestSuite:
             if len(files) >= 2:
                 passed = assert_equal(files[0]['name'], 'login.py', "Highest scored auth file should be first") and passed
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_4_2_high_risk_files_boosted(self):
         """Test 4.2: Verify high-risk files get scoring boost"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "4.2: High-risk files boosted"
 
         try:
-            from cartographer import _select_relevant_files
-
-            scan_data = {
-                'nodes': [
-                    {
-                        'id': 'low',
-                        'name': 'low.py',
-                        'path': '/low.py',
-                        'risk_score': 20,
-                        'git_changes': 0,
-                        'concerns': ['test']
-                    },
-                    {
-                        'id': 'high',
-                        'name': 'high.py',
-                        'path': '/high.py',
-                        'risk_score': 85,
-                        'git_changes': 0,
-                        'concerns': ['test']
-                    }
-                ]
-            }
+            scan_data = _FIXTURE_RISK_NODES
 
             query = "test"
             files = _select_relevant_files(query, scan_data, max_files=10)
@@ -960,38 +1017,17 @@ class TestSuite:
                 print_test("High risk file not prioritized", "FAIL")
                 passed = False
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_4_3_recent_changes_boost(self):
         """Test 4.3: Verify files with recent git changes get boost"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "4.3: Recent changes boost"
 
         try:
-            from cartographer import _select_relevant_files
-
-            scan_data = {
-                'nodes': [
-                    {
-                        'id': 'old',
-                        'name': 'old.py',
-                        'path': '/old.py',
-                        'risk_score': 50,
-                        'git_changes': 1,
-                        'concerns': ['api']
-                    },
-                    {
-                        'id': 'recent',
-                        'name': 'recent.py',
-                        'path': '/recent.py',
-                        'risk_score': 50,
-                        'git_changes': 15,
-                        'concerns': ['api']
-                    }
-                ]
-            }
+            scan_data = _FIXTURE_RECENT_NODES
 
             query = "api"
             files = _select_relevant_files(query, scan_data, max_files=10)
@@ -1004,33 +1040,24 @@ class TestSuite:
                 print_test("Recent file not prioritized", "FAIL")
                 passed = False
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # PHASE 5: API Integration Tests (Real DeepSeek Calls)
     # ───────────────────────────────────────────────────────────────────
 
-    def test_5_1_chat_with_deepseek_coder(self):
+    @requires_api_key("5.1: Chat with deepseek-coder")
+    def test_5_1_chat_with_deepseek_coder(self, test_name):
         """Test 5.1: Test actual API call to DeepSeek with coder model"""
-        start = time.time()
-        test_name = "5.1: Chat with deepseek-coder"
-
-        if not self.runner.api_key or self.runner.api_key == 'test-mock-key':
-            print_test(f"{test_name}: Skipped (no API key)", "WARN")
-            self.runner.record_test(test_name, True, time.time() - start)
-            return
+        start = time.perf_counter()
 
         try:
-            response = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'Find security vulnerabilities in authentication files',
-                    'project_id': self.auth_project_id,
-                    'model': 'deepseek-coder'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response = self._post_chat(
+                'Find security vulnerabilities in authentication files',
+                self.auth_project_id,
+                model='deepseek-coder'
             )
 
             passed = assert_status(response, 200, test_name)
@@ -1053,7 +1080,7 @@ class TestSuite:
                         model='deepseek-coder',
                         context_size=data.get('context_size', 0),
                         tokens_used=len(data['response']) // 4,
-                        response_time=response.elapsed.total_seconds()
+                        response_time=time.perf_counter() - start
                     )
 
                     # Verify quality: Should reference specific files
@@ -1061,7 +1088,7 @@ class TestSuite:
                     quality_score = {
                         'length': len(ai_response),
                         'has_file_refs': '.py' in ai_response or 'File:' in ai_response,
-                        'has_security_terms': 'security' in ai_response.lower() or 'vulnerability' in ai_response.lower()
+                        'has_security_terms': _SECURITY_TERMS_RE.search(ai_response) is not None
                     }
                     self.runner.metrics['response_quality'].append({
                         'test': test_name,
@@ -1069,40 +1096,32 @@ class TestSuite:
                         'quality': quality_score
                     })
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_5_2_chat_history_accumulation(self):
         """Test 5.2: Verify chat history builds up correctly"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "5.2: Chat history accumulation"
 
         try:
             # Send first message
-            response1 = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'What authentication files exist?',
-                    'project_id': self.auth_project_id,
-                    'model': 'deepseek-coder'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response1 = self._post_chat(
+                'What authentication files exist?',
+                self.auth_project_id,
+                model='deepseek-coder'
             )
 
             # Send follow-up
-            response2 = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'Review the login file for security issues',
-                    'project_id': self.auth_project_id,
-                    'model': 'deepseek-coder'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response2 = self._post_chat(
+                'Review the login file for security issues',
+                self.auth_project_id,
+                model='deepseek-coder'
             )
 
             # Check history
-            response = requests.get(
+            response = self.runner.session.get(
                 f"{self.runner.base_url}/api/chat/history",
                 params={'project_id': self.auth_project_id},
                 timeout=TestConfig.API_TIMEOUT
@@ -1113,22 +1132,17 @@ class TestSuite:
                 history = response.json().get('messages', [])
                 passed = assert_greater(len(history), 2, "Should have multiple messages in history")
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
-    def test_5_3_structured_json_output(self):
+    @requires_api_key("5.3: Structured JSON output")
+    def test_5_3_structured_json_output(self, test_name):
         """Test 5.3: Test /api/chat/structured endpoint returns valid JSON"""
-        start = time.time()
-        test_name = "5.3: Structured JSON output"
-
-        if not self.runner.api_key or self.runner.api_key == 'test-mock-key':
-            print_test(f"{test_name}: Skipped (no API key)", "WARN")
-            self.runner.record_test(test_name, True, time.time() - start)
-            return
+        start = time.perf_counter()
 
         try:
-            response = requests.post(
+            response = self.runner.session.post(
                 f"{self.runner.base_url}/api/chat/structured",
                 json={
                     'message': 'Find all security and performance issues',
@@ -1151,33 +1165,24 @@ class TestSuite:
                 if passed:
                     print_test("Structured JSON output valid", "PASS")
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # PHASE 6: Model-Specific Prompt Tests
     # ───────────────────────────────────────────────────────────────────
 
-    def test_6_1_coder_provides_file_paths(self):
+    @requires_api_key("6.1: Coder model provides file paths")
+    def test_6_1_coder_provides_file_paths(self, test_name):
         """Test 6.1: Verify deepseek-coder includes file paths in responses"""
-        start = time.time()
-        test_name = "6.1: Coder model provides file paths"
-
-        if not self.runner.api_key or self.runner.api_key == 'test-mock-key':
-            print_test(f"{test_name}: Skipped (no API key)", "WARN")
-            self.runner.record_test(test_name, True, time.time() - start)
-            return
+        start = time.perf_counter()
 
         try:
-            response = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'Show me how to fix the SQL injection in login',
-                    'project_id': self.auth_project_id,
-                    'model': 'deepseek-coder'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response = self._post_chat(
+                'Show me how to fix the SQL injection in login',
+                self.auth_project_id,
+                model='deepseek-coder'
             )
 
             passed = assert_status(response, 200, test_name)
@@ -1194,29 +1199,20 @@ class TestSuite:
                 else:
                     print_test("Coder model missing file paths", "FAIL")
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
-    def test_6_2_reasoner_model_response(self):
+    @requires_api_key("6.2: Reasoner model response")
+    def test_6_2_reasoner_model_response(self, test_name):
         """Test 6.2: Verify deepseek-reasoner provides response"""
-        start = time.time()
-        test_name = "6.2: Reasoner model response"
-
-        if not self.runner.api_key or self.runner.api_key == 'test-mock-key':
-            print_test(f"{test_name}: Skipped (no API key)", "WARN")
-            self.runner.record_test(test_name, True, time.time() - start)
-            return
+        start = time.perf_counter()
 
         try:
-            response = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'Analyze the authentication flow',
-                    'project_id': self.auth_project_id,
-                    'model': 'deepseek-reasoner'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response = self._post_chat(
+                'Analyze the authentication flow',
+                self.auth_project_id,
+                model='deepseek-reasoner'
             )
 
             passed = assert_status(response, 200, test_name)
@@ -1225,29 +1221,20 @@ class TestSuite:
                 # R1 should provide reasoning-oriented output
                 passed = assert_greater(len(data.get('response', '')), 50, "Response should be substantial")
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
-    def test_6_3_chat_model_conversational(self):
+    @requires_api_key("6.3: Chat model conversational")
+    def test_6_3_chat_model_conversational(self, test_name):
         """Test 6.3: Verify deepseek-chat is more conversational"""
-        start = time.time()
-        test_name = "6.3: Chat model conversational"
-
-        if not self.runner.api_key or self.runner.api_key == 'test-mock-key':
-            print_test(f"{test_name}: Skipped (no API key)", "WARN")
-            self.runner.record_test(test_name, True, time.time() - start)
-            return
+        start = time.perf_counter()
 
         try:
-            response = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'What does this project do?',
-                    'project_id': self.auth_project_id,
-                    'model': 'deepseek-chat'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response = self._post_chat(
+                'What does this project do?',
+                self.auth_project_id,
+                model='deepseek-chat'
             )
 
             passed = assert_status(response, 200, test_name)
@@ -1256,9 +1243,9 @@ class TestSuite:
                 passed = assert_equal(data.get('model'), 'deepseek-chat', "Model should be chat")
                 passed = assert_greater(len(data.get('response', '')), 0, "Response should be non-empty") and passed
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # PHASE 7: Error Handling & Edge Cases
@@ -1266,34 +1253,30 @@ class TestSuite:
 
     def test_7_1_invalid_model_name(self):
         """Test 7.1: Test behavior with invalid model name"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "7.1: Invalid model name handling"
 
         try:
-            response = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'test',
-                    'project_id': self.auth_project_id,
-                    'model': 'invalid-model'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response = self._post_chat(
+                'test',
+                self.auth_project_id,
+                model='invalid-model'
             )
 
             # Should fall back to default or error gracefully
             passed = assert_in_list(response.status_code, [200, 400, 500], "Should handle gracefully")
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_7_2_missing_message(self):
         """Test 7.2: Verify error when message is missing"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "7.2: Missing message parameter"
 
         try:
-            response = requests.post(
+            response = self.runner.session.post(
                 f"{self.runner.base_url}/api/chat",
                 json={'project_id': self.auth_project_id},
                 timeout=TestConfig.API_TIMEOUT
@@ -1301,31 +1284,27 @@ class TestSuite:
 
             passed = assert_status(response, 400, "Should return 400 for missing message")
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     def test_7_3_invalid_project_id(self):
         """Test 7.3: Test behavior with invalid project ID"""
-        start = time.time()
+        start = time.perf_counter()
         test_name = "7.3: Invalid project ID handling"
 
         try:
-            response = requests.post(
-                f"{self.runner.base_url}/api/chat",
-                json={
-                    'message': 'test',
-                    'project_id': 'invalid-project-id-999'
-                },
-                timeout=TestConfig.API_TIMEOUT
+            response = self._post_chat(
+                'test',
+                'invalid-project-id-999'
             )
 
             # Should handle gracefully
             passed = assert_in_list(response.status_code, [200, 400, 404], "Should handle gracefully")
 
-            self.runner.record_test(test_name, passed, time.time() - start)
+            self.runner.record_test(test_name, passed, time.perf_counter() - start)
         except Exception as e:
-            self.runner.record_test(test_name, False, time.time() - start, str(e))
+            self.runner.record_test(test_name, False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # Report Generation
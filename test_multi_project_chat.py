@@ -4,18 +4,19 @@ Multi-Project Chat Test Suite
 Comprehensive HTTP-based testing for multi-project chat functionality
 """
 
+import io
 import os
 import sys
 import json
 import time
+import contextlib
+import socket
 import shutil
 import requests
-import threading
-import tempfile
 from pathlib import Path
 from datetime import datetime
-from unittest.mock import Mock, patch, MagicMock
-from http.server import HTTPServer
+from types import SimpleNamespace
+from requests.adapters import HTTPAdapter
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Configuration
@@ -23,8 +24,7 @@ from http.server import HTTPServer
 
 class TestConfig:
     """Test configuration"""
-    SERVER_PORT = 3001
-    SERVER_URL = f"http://localhost:{SERVER_PORT}"
+    SERVER_PORT = 0  # 0 = pick a free ephemeral port at startup (allows concurrent runs)
     TEST_PROJECT_DIR = Path("/tmp/cartographer_test_projects")
     RESULTS_DIR = Path(__file__).parent
     API_TIMEOUT = 10
@@ -54,6 +54,13 @@ def print_test(message, level="INFO"):
     print(f"{icon} {message}")
 
 
+def find_free_port():
+    """Ask the OS for an unused localhost TCP port"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
 def assert_status(response, expected_code, test_name):
     """Assert HTTP status code"""
     if response.status_code == expected_code:
@@ -150,7 +157,8 @@ class TestServer:
     """Manages HTTP server lifecycle for testing"""
 
     def __init__(self, port=TestConfig.SERVER_PORT):
-        self.port = port
+        self.port = port or find_free_port()
+        self.base_url = f"http://localhost:{self.port}"
         self.server_process = None
 
     def start(self):
@@ -179,15 +187,24 @@ class TestServer:
 
     def wait_for_ready(self, timeout=TestConfig.SERVER_START_TIMEOUT):
         """Poll server until it responds"""
-        start = time.time()
-        while time.time() - start < timeout:
+        start = time.perf_counter()
+        attempts = 0
+        while time.perf_counter() - start < timeout:
+            # Cheap TCP probe first; only hit the app once the port accepts connections
+            try:
+                socket.create_connection(('localhost', self.port), timeout=0.05).close()
+            except OSError:
+                time.sleep(min(0.1, 0.005 * 2 ** attempts))
+                attempts += 1
+                continue
+
             try:
-                response = requests.get(f"{TestConfig.SERVER_URL}/api/scan", timeout=2)
+                response = requests.get(f"{self.base_url}/api/scan", timeout=2)
                 if response.status_code in [200, 404]:
                     print_test("Test server ready ✓", "PASS")
                     return True
             except:
-                time.sleep(0.5)
+                time.sleep(0.05)
 
         print_test("Server failed to start ✗", "FAIL")
         return False
@@ -223,12 +240,14 @@ class TestProjects:
             Path to created project
         """
         project_path = TestConfig.TEST_PROJECT_DIR / name
-        project_path.mkdir(parents=True, exist_ok=True)
+        file_paths = {project_path / rel_path: content for rel_path, content in files.items()}
 
-        for rel_path, content in files.items():
-            file_path = project_path / rel_path
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(content)
+        # Create each directory once up front, then write files with no per-file mkdir
+        for directory in {project_path, *(file_path.parent for file_path in file_paths)}:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        for file_path, content in file_paths.items():
+            file_path.write_bytes(content.encode('utf-8'))
 
         return str(project_path)
 
@@ -392,7 +411,11 @@ class Service{i}:
 class TestRunner:
     """Orchestrates all test scenarios"""
 
-    def __init__(self):
+    # Very long query for the context overflow test (8.7)
+    _LONG_QUERY = 'Analyze everything' * 100
+
+    def __init__(self, base_url):
+        self.base_url = base_url
         self.results = {
             'total': 0,
             'passed': 0,
@@ -402,6 +425,11 @@ class TestRunner:
         }
         self.project_ids = {}
         self.issues = []
+        self.file_id_for_test = None  # Set by test 7.1, used by 7.2
+
+        # Pooled keep-alive connections to the local test server
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0))
 
     def run_all(self):
         """Run all test groups"""
@@ -451,6 +479,7 @@ class TestRunner:
     def teardown(self):
         """Cleanup test environment"""
         print_test("\nCleaning up test environment...", "INFO")
+        self.session.close()
         TestProjects.cleanup()
         print_test("Test projects removed ✓", "PASS")
 
@@ -471,6 +500,18 @@ class TestRunner:
             'error': error
         })
 
+    @contextlib.contextmanager
+    def _test(self, name):
+        """Time a test body and record it; set rec.passed, exceptions record a failure"""
+        rec = SimpleNamespace(passed=False)
+        start = time.perf_counter()
+        try:
+            yield rec
+        except Exception as e:
+            self.record_test(name, False, time.perf_counter() - start, str(e))
+        else:
+            self.record_test(name, rec.passed, time.perf_counter() - start)
+
     # ───────────────────────────────────────────────────────────────────
     # GROUP 1: Backward Compatibility (3 tests)
     # ───────────────────────────────────────────────────────────────────
@@ -480,10 +521,10 @@ class TestRunner:
         print_test("GROUP 1] Backward Compatibility", "SECTION")
 
         # Test 1.1: Load single project
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/load-project",
+            response = self.session.post(
+                f"{self.base_url}/api/load-project",
                 json={'path': self.project_a_path},
                 timeout=TestConfig.API_TIMEOUT
             )
@@ -496,19 +537,19 @@ class TestRunner:
                 if 'project_id' in data:
                     self.project_ids['A'] = data['project_id']
 
-            self.record_test("1.1: Load single project", passed, time.time() - start)
+            self.record_test("1.1: Load single project", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("1.1: Load single project", False, time.time() - start, str(e))
+            self.record_test("1.1: Load single project", False, time.perf_counter() - start, str(e))
 
         # Test 1.2: Single-project chat
-        start = time.time()
+        start = time.perf_counter()
         if not HAS_API_KEY:
             print_test("Test 1.2: Skipped (no API key)", "WARN")
-            self.record_test("1.2: Single-project chat", True, time.time() - start)
+            self.record_test("1.2: Single-project chat", True, time.perf_counter() - start)
         else:
             try:
-                response = requests.post(
-                    f"{TestConfig.SERVER_URL}/api/chat",
+                response = self.session.post(
+                    f"{self.base_url}/api/chat",
                     json={
                         'message': 'What authentication files exist?',
                         'project_id': self.project_ids.get('A')
@@ -524,20 +565,20 @@ class TestRunner:
                     if 'context_size' in data:
                         passed = assert_less(data['context_size'], 35000, "Context size reasonable") and passed
 
-                self.record_test("1.2: Single-project chat", passed, time.time() - start)
+                self.record_test("1.2: Single-project chat", passed, time.perf_counter() - start)
             except Exception as e:
                 # If API error due to mock key, consider it expected
                 if "API" in str(e) or "key" in str(e).lower():
                     print_test("Test 1.2: Expected API error with mock key", "WARN")
-                    self.record_test("1.2: Single-project chat", True, time.time() - start)
+                    self.record_test("1.2: Single-project chat", True, time.perf_counter() - start)
                 else:
-                    self.record_test("1.2: Single-project chat", False, time.time() - start, str(e))
+                    self.record_test("1.2: Single-project chat", False, time.perf_counter() - start, str(e))
 
         # Test 1.3: Get single-project history
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.get(
-                f"{TestConfig.SERVER_URL}/api/chat/history",
+            response = self.session.get(
+                f"{self.base_url}/api/chat/history",
                 params={'project_id': self.project_ids.get('A')},
                 timeout=TestConfig.API_TIMEOUT
             )
@@ -552,12 +593,12 @@ class TestRunner:
                 elif 'messages' in data:
                     passed = assert_greater(len(data['messages']), 0, "History not empty") and passed
 
-            self.record_test("1.3: Get project history", passed, time.time() - start)
+            self.record_test("1.3: Get project history", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("1.3: Get project history", False, time.time() - start, str(e))
+            self.record_test("1.3: Get project history", False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
-    # GROUP 2: Multi-Project Activation (4 tests)
+    # GROUP 2: Multi-Project Activation (3 tests)
     # ───────────────────────────────────────────────────────────────────
 
     def group_2_multi_project_activation(self):
@@ -565,10 +606,10 @@ class TestRunner:
         print_test("GROUP 2] Multi-Project Activation", "SECTION")
 
         # Test 2.1: Load second project
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/load-project",
+            response = self.session.post(
+                f"{self.base_url}/api/load-project",
                 json={'path': self.project_b_path},
                 timeout=TestConfig.API_TIMEOUT
             )
@@ -580,15 +621,15 @@ class TestRunner:
                     self.project_ids['B'] = data['project_id']
                     passed = True
 
-            self.record_test("2.1: Load second project", passed, time.time() - start)
+            self.record_test("2.1: Load second project", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("2.1: Load second project", False, time.time() - start, str(e))
+            self.record_test("2.1: Load second project", False, time.perf_counter() - start, str(e))
 
         # Test 2.2: List projects
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.get(
-                f"{TestConfig.SERVER_URL}/api/projects",
+            response = self.session.get(
+                f"{self.base_url}/api/projects",
                 timeout=TestConfig.API_TIMEOUT
             )
 
@@ -598,15 +639,15 @@ class TestRunner:
                 if 'projects' in data:
                     passed = assert_equal(len(data['projects']), 2, "Two projects loaded")
 
-            self.record_test("2.2: List projects", passed, time.time() - start)
+            self.record_test("2.2: List projects", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("2.2: List projects", False, time.time() - start, str(e))
+            self.record_test("2.2: List projects", False, time.perf_counter() - start, str(e))
 
         # Test 2.3: Send multi-project chat
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+            response = self.session.post(
+                f"{self.base_url}/api/chat",
                 json={
                     'message': 'What API endpoints exist across projects?',
                     'multi_project_mode': True,
@@ -619,19 +660,17 @@ class TestRunner:
             if passed:
                 data = response.json()
                 passed = assert_field_exists(data, 'response', "Response received")
+                if 'response' in data:
+                    # Both projects should make it into the answer
+                    passed = assert_contains(data['response'], 'auth', "Project A represented") and passed
+                    passed = assert_contains(data['response'], 'gateway', "Project B represented") and passed
 
-            self.record_test("2.3: Multi-project chat", passed, time.time() - start)
+            self.record_test("2.3: Multi-project chat", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("2.3: Multi-project chat", False, time.time() - start, str(e))
-
-        # Test 2.4: Verify context includes both projects
-        # (This is implicit in the chat call above - the API should handle it)
-        start = time.time()
-        passed = True  # If previous test passed, this is verified
-        self.record_test("2.4: Context includes both projects", passed, time.time() - start)
+            self.record_test("2.3: Multi-project chat", False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
-    # GROUP 3: Context Distribution (2 tests)
+    # GROUP 3: Context Distribution (1 test)
     # ───────────────────────────────────────────────────────────────────
 
     def group_3_context_distribution(self):
@@ -639,10 +678,10 @@ class TestRunner:
         print_test("GROUP 3] Context Distribution", "SECTION")
 
         # Test 3.1: Context size stays under limit
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+            response = self.session.post(
+                f"{self.base_url}/api/chat",
                 json={
                     'message': 'Analyze all files in both projects',
                     'multi_project_mode': True,
@@ -657,18 +696,12 @@ class TestRunner:
                 if 'context_size' in data:
                     passed = assert_less(data['context_size'], 35000, "Context under 35K chars")
 
-            self.record_test("3.1: Context size limit", passed, time.time() - start)
+            self.record_test("3.1: Context size limit", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("3.1: Context size limit", False, time.time() - start, str(e))
-
-        # Test 3.2: Both projects represented
-        # (Verified implicitly through successful multi-project chat)
-        start = time.time()
-        passed = True
-        self.record_test("3.2: Both projects in context", passed, time.time() - start)
+            self.record_test("3.1: Context size limit", False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
-    # GROUP 4: History Management (5 tests)
+    # GROUP 4: History Management (4 tests)
     # ───────────────────────────────────────────────────────────────────
 
     def group_4_history_management(self):
@@ -676,10 +709,10 @@ class TestRunner:
         print_test("GROUP 4] History Management", "SECTION")
 
         # Test 4.1: Send multi-project messages
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+            response = self.session.post(
+                f"{self.base_url}/api/chat",
                 json={
                     'message': 'Test message 1 in multi-project mode',
                     'multi_project_mode': True,
@@ -689,15 +722,15 @@ class TestRunner:
             )
 
             passed = assert_status(response, 200, "Test 4.1: Send multi-project message")
-            self.record_test("4.1: Send multi-project message", passed, time.time() - start)
+            self.record_test("4.1: Send multi-project message", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("4.1: Send multi-project message", False, time.time() - start, str(e))
+            self.record_test("4.1: Send multi-project message", False, time.perf_counter() - start, str(e))
 
         # Test 4.2: Get multi-project history
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.get(
-                f"{TestConfig.SERVER_URL}/api/chat/multi-history",
+            response = self.session.get(
+                f"{self.base_url}/api/chat/multi-history",
                 timeout=TestConfig.API_TIMEOUT
             )
 
@@ -708,30 +741,30 @@ class TestRunner:
                     # Should have messages from multi-project chats
                     passed = assert_greater(len(data['messages']), 0, "Multi-history not empty")
 
-            self.record_test("4.2: Get multi-history", passed, time.time() - start)
+            self.record_test("4.2: Get multi-history", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("4.2: Get multi-history", False, time.time() - start, str(e))
+            self.record_test("4.2: Get multi-history", False, time.perf_counter() - start, str(e))
 
         # Test 4.3: Per-project history unchanged
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.get(
-                f"{TestConfig.SERVER_URL}/api/chat/history",
+            response = self.session.get(
+                f"{self.base_url}/api/chat/history",
                 params={'project_id': self.project_ids.get('A')},
                 timeout=TestConfig.API_TIMEOUT
             )
 
             passed = assert_status(response, 200, "Test 4.3: Get per-project history")
             # Multi-project messages should NOT be in per-project history
-            self.record_test("4.3: Per-project history independent", passed, time.time() - start)
+            self.record_test("4.3: Per-project history independent", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("4.3: Per-project history independent", False, time.time() - start, str(e))
+            self.record_test("4.3: Per-project history independent", False, time.perf_counter() - start, str(e))
 
         # Test 4.4: Send single-project message
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+            response = self.session.post(
+                f"{self.base_url}/api/chat",
                 json={
                     'message': 'Single project test message',
                     'project_id': self.project_ids.get('A')
@@ -740,14 +773,9 @@ class TestRunner:
             )
 
             passed = assert_status(response, 200, "Test 4.4: Send single-project message")
-            self.record_test("4.4: Send single-project message", passed, time.time() - start)
+            self.record_test("4.4: Send single-project message", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("4.4: Send single-project message", False, time.time() - start, str(e))
-
-        # Test 4.5: Verify histories remain independent
-        start = time.time()
-        passed = True  # Implicit verification
-        self.record_test("4.5: Histories independent", passed, time.time() - start)
+            self.record_test("4.4: Send single-project message", False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # GROUP 5: Mode Switching (4 tests)
@@ -758,11 +786,11 @@ class TestRunner:
         print_test("GROUP 5] Mode Switching", "SECTION")
 
         # Test 5.1: Build multi-project history
-        start = time.time()
+        start = time.perf_counter()
         try:
             for i in range(2):
-                requests.post(
-                    f"{TestConfig.SERVER_URL}/api/chat",
+                self.session.post(
+                    f"{self.base_url}/api/chat",
                     json={
                         'message': f'Multi-project message {i}',
                         'multi_project_mode': True,
@@ -771,15 +799,15 @@ class TestRunner:
                     timeout=TestConfig.API_TIMEOUT
                 )
             passed = True
-            self.record_test("5.1: Build multi-history", passed, time.time() - start)
+            self.record_test("5.1: Build multi-history", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("5.1: Build multi-history", False, time.time() - start, str(e))
+            self.record_test("5.1: Build multi-history", False, time.perf_counter() - start, str(e))
 
         # Test 5.2: Switch to single-project mode
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+            response = self.session.post(
+                f"{self.base_url}/api/chat",
                 json={
                     'message': 'Switched to single mode',
                     'project_id': self.project_ids.get('A')
@@ -787,15 +815,15 @@ class TestRunner:
                 timeout=TestConfig.API_TIMEOUT
             )
             passed = assert_status(response, 200, "Test 5.2: Switch to single mode")
-            self.record_test("5.2: Switch to single mode", passed, time.time() - start)
+            self.record_test("5.2: Switch to single mode", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("5.2: Switch to single mode", False, time.time() - start, str(e))
+            self.record_test("5.2: Switch to single mode", False, time.perf_counter() - start, str(e))
 
         # Test 5.3: Switch back to multi-project
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+            response = self.session.post(
+                f"{self.base_url}/api/chat",
                 json={
                     'message': 'Back to multi mode',
                     'multi_project_mode': True,
@@ -804,15 +832,15 @@ class TestRunner:
                 timeout=TestConfig.API_TIMEOUT
             )
             passed = assert_status(response, 200, "Test 5.3: Switch back to multi")
-            self.record_test("5.3: Switch back to multi", passed, time.time() - start)
+            self.record_test("5.3: Switch back to multi", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("5.3: Switch back to multi", False, time.time() - start, str(e))
+            self.record_test("5.3: Switch back to multi", False, time.perf_counter() - start, str(e))
 
         # Test 5.4: Verify multi-history preserved
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.get(
-                f"{TestConfig.SERVER_URL}/api/chat/multi-history",
+            response = self.session.get(
+                f"{self.base_url}/api/chat/multi-history",
                 timeout=TestConfig.API_TIMEOUT
             )
             passed = assert_status(response, 200, "Test 5.4: Multi-history preserved")
@@ -821,9 +849,9 @@ class TestRunner:
                 if 'messages' in data:
                     # Should have accumulated messages
                     passed = assert_greater(len(data['messages']), 4, "History preserved")
-            self.record_test("5.4: History preserved", passed, time.time() - start)
+            self.record_test("5.4: History preserved", passed, time.perf_counter() - start)
         except Exception as e:
-            self.record_test("5.4: History preserved", False, time.time() - start, str(e))
+            self.record_test("5.4: History preserved", False, time.perf_counter() - start, str(e))
 
     # ───────────────────────────────────────────────────────────────────
     # GROUP 6: Project Closure (4 tests)
@@ -833,67 +861,55 @@ class TestRunner:
         """Test auto-disable when project count drops below 2"""
         print_test("GROUP 6] Project Closure", "SECTION")
 
+        project_a = self.project_ids.get('A')
+        project_b = self.project_ids.get('B')
+        chat_url = f"{self.base_url}/api/chat"
+
         # Test 6.1: Chat in multi-project mode
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+        with self._test("6.1: Chat before closure") as rec:
+            response = self.session.post(
+                chat_url,
                 json={
                     'message': 'Before closing project',
                     'multi_project_mode': True,
-                    'project_ids': [self.project_ids.get('A'), self.project_ids.get('B')]
+                    'project_ids': [project_a, project_b]
                 },
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 200, "Test 6.1: Chat before closure")
-            self.record_test("6.1: Chat before closure", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("6.1: Chat before closure", False, time.time() - start, str(e))
+            rec.passed = assert_status(response, 200, "Test 6.1: Chat before closure")
 
         # Test 6.2: Unload project B
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/projects/unload",
-                json={'project_id': self.project_ids.get('B')},
+        with self._test("6.2: Unload project") as rec:
+            response = self.session.post(
+                f"{self.base_url}/api/projects/unload",
+                json={'project_id': project_b},
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 200, "Test 6.2: Unload project")
-            self.record_test("6.2: Unload project", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("6.2: Unload project", False, time.time() - start, str(e))
+            rec.passed = assert_status(response, 200, "Test 6.2: Unload project")
 
         # Test 6.3: Verify only 1 project remains
-        start = time.time()
-        try:
-            response = requests.get(
-                f"{TestConfig.SERVER_URL}/api/projects",
+        with self._test("6.3: One project remains") as rec:
+            response = self.session.get(
+                f"{self.base_url}/api/projects",
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 200, "Test 6.3: List projects")
-            if passed:
+            rec.passed = assert_status(response, 200, "Test 6.3: List projects")
+            if rec.passed:
                 data = response.json()
                 if 'projects' in data:
-                    passed = assert_equal(len(data['projects']), 1, "One project remains")
-            self.record_test("6.3: One project remains", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("6.3: One project remains", False, time.time() - start, str(e))
+                    rec.passed = assert_equal(len(data['projects']), 1, "One project remains")
 
         # Test 6.4: Chat still works with single project
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+        with self._test("6.4: Chat after closure") as rec:
+            response = self.session.post(
+                chat_url,
                 json={
                     'message': 'After project closure',
-                    'project_id': self.project_ids.get('A')
+                    'project_id': project_a
                 },
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 200, "Test 6.4: Chat after closure")
-            self.record_test("6.4: Chat after closure", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("6.4: Chat after closure", False, time.time() - start, str(e))
+            rec.passed = assert_status(response, 200, "Test 6.4: Chat after closure")
 
     # ───────────────────────────────────────────────────────────────────
     # GROUP 7: File Selection (2 tests)
@@ -903,32 +919,32 @@ class TestRunner:
         """Test project-qualified file IDs"""
         print_test("GROUP 7] File Selection", "SECTION")
 
+        project_a = self.project_ids.get('A')
+        project_b = self.project_ids.get('B')
+        chat_url = f"{self.base_url}/api/chat"
+
         # Test 7.1: Get scan data to extract file ID
-        start = time.time()
-        try:
-            response = requests.get(
-                f"{TestConfig.SERVER_URL}/api/scan",
-                params={'project_id': self.project_ids.get('A')},
+        with self._test("7.1: Extract file ID") as rec:
+            response = self.session.get(
+                f"{self.base_url}/api/scan",
+                params={'project_id': project_a},
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 200, "Test 7.1: Get scan data")
+            rec.passed = assert_status(response, 200, "Test 7.1: Get scan data")
 
             file_id = None
-            if passed:
+            if rec.passed:
                 data = response.json()
                 if 'nodes' in data and len(data['nodes']) > 0:
                     file_id = data['nodes'][0]['id']
-                    passed = True
+                    rec.passed = True
 
             self.file_id_for_test = file_id
-            self.record_test("7.1: Extract file ID", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("7.1: Extract file ID", False, time.time() - start, str(e))
 
         # Reload project B for this test
         try:
-            requests.post(
-                f"{TestConfig.SERVER_URL}/api/load-project",
+            self.session.post(
+                f"{self.base_url}/api/load-project",
                 json={'path': self.project_b_path},
                 timeout=TestConfig.API_TIMEOUT
             )
@@ -936,27 +952,22 @@ class TestRunner:
             pass
 
         # Test 7.2: Chat with project-qualified file ID
-        start = time.time()
-        try:
-            if hasattr(self, 'file_id_for_test') and self.file_id_for_test:
-                qualified_id = f"{self.project_ids.get('A')}:{self.file_id_for_test}"
-                response = requests.post(
-                    f"{TestConfig.SERVER_URL}/api/chat",
+        with self._test("7.2: File selection") as rec:
+            if self.file_id_for_test:
+                qualified_id = f"{project_a}:{self.file_id_for_test}"
+                response = self.session.post(
+                    chat_url,
                     json={
                         'message': 'Analyze this file',
                         'multi_project_mode': True,
-                        'project_ids': [self.project_ids.get('A'), self.project_ids.get('B')],
+                        'project_ids': [project_a, project_b],
                         'include_files': [qualified_id]
                     },
                     timeout=TestConfig.API_TIMEOUT
                 )
-                passed = assert_status(response, 200, "Test 7.2: Chat with file selection")
+                rec.passed = assert_status(response, 200, "Test 7.2: Chat with file selection")
             else:
-                passed = False
-
-            self.record_test("7.2: File selection", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("7.2: File selection", False, time.time() - start, str(e))
+                rec.passed = False
 
     # ───────────────────────────────────────────────────────────────────
     # GROUP 8: Edge Cases (8 tests)
@@ -966,24 +977,23 @@ class TestRunner:
         """Test error handling and edge cases"""
         print_test("GROUP 8] Edge Cases", "SECTION")
 
+        project_a = self.project_ids.get('A')
+        project_b = self.project_ids.get('B')
+        chat_url = f"{self.base_url}/api/chat"
+
         # Test 8.1: Clear multi-project history
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat/multi-clear",
+        with self._test("8.1: Clear multi-history") as rec:
+            response = self.session.post(
+                f"{self.base_url}/api/chat/multi-clear",
                 json={},
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 200, "Test 8.1: Clear multi-history")
-            self.record_test("8.1: Clear multi-history", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("8.1: Clear multi-history", False, time.time() - start, str(e))
+            rec.passed = assert_status(response, 200, "Test 8.1: Clear multi-history")
 
         # Test 8.2: Invalid project ID
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+        with self._test("8.2: Invalid project ID") as rec:
+            response = self.session.post(
+                chat_url,
                 json={
                     'message': 'Test',
                     'project_id': 'invalid-project-id-999'
@@ -991,31 +1001,23 @@ class TestRunner:
                 timeout=TestConfig.API_TIMEOUT
             )
             # Should return 200 but with empty context or handle gracefully
-            passed = response.status_code in [200, 400, 404]
+            rec.passed = response.status_code in [200, 400, 404]
             print_test(f"Test 8.2: Invalid project handled (status: {response.status_code})",
-                      "PASS" if passed else "FAIL")
-            self.record_test("8.2: Invalid project ID", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("8.2: Invalid project ID", False, time.time() - start, str(e))
+                      "PASS" if rec.passed else "FAIL")
 
         # Test 8.3: Missing message parameter
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
-                json={'project_id': self.project_ids.get('A')},
+        with self._test("8.3: Missing message") as rec:
+            response = self.session.post(
+                chat_url,
+                json={'project_id': project_a},
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 400, "Test 8.3: Missing message")
-            self.record_test("8.3: Missing message", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("8.3: Missing message", False, time.time() - start, str(e))
+            rec.passed = assert_status(response, 400, "Test 8.3: Missing message")
 
         # Test 8.4: Empty project_ids array
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+        with self._test("8.4: Empty project_ids") as rec:
+            response = self.session.post(
+                chat_url,
                 json={
                     'message': 'Test',
                     'multi_project_mode': True,
@@ -1024,51 +1026,39 @@ class TestRunner:
                 timeout=TestConfig.API_TIMEOUT
             )
             # Should handle gracefully
-            passed = response.status_code in [200, 400]
+            rec.passed = response.status_code in [200, 400]
             print_test(f"Test 8.4: Empty project_ids handled (status: {response.status_code})",
-                      "PASS" if passed else "FAIL")
-            self.record_test("8.4: Empty project_ids", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("8.4: Empty project_ids", False, time.time() - start, str(e))
+                      "PASS" if rec.passed else "FAIL")
 
         # Test 8.5: Exceed MAX_PROJECTS
-        start = time.time()
-        try:
+        with self._test("8.5: Max projects limit") as rec:
             # Create a third project
             project_c_path = TestProjects.create_project(
                 TestConfig.PROJECT_C_NAME,
                 {'main.py': 'print("hello")'}
             )
 
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/load-project",
+            response = self.session.post(
+                f"{self.base_url}/api/load-project",
                 json={'path': project_c_path},
                 timeout=TestConfig.API_TIMEOUT
             )
 
             # Should fail with 400 (max projects exceeded)
-            passed = assert_status(response, 400, "Test 8.5: Max projects limit")
-            self.record_test("8.5: Max projects limit", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("8.5: Max projects limit", False, time.time() - start, str(e))
+            rec.passed = assert_status(response, 400, "Test 8.5: Max projects limit")
 
         # Test 8.6: Malformed JSON
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat",
+        with self._test("8.6: Malformed JSON") as rec:
+            response = self.session.post(
+                chat_url,
                 data="invalid json {{{",
                 headers={'Content-Type': 'application/json'},
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 400, "Test 8.6: Malformed JSON")
-            self.record_test("8.6: Malformed JSON", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("8.6: Malformed JSON", False, time.time() - start, str(e))
+            rec.passed = assert_status(response, 400, "Test 8.6: Malformed JSON")
 
         # Test 8.7: Context overflow
-        start = time.time()
-        try:
+        with self._test("8.7: Context overflow") as rec:
             # Create large project
             large_project_path = TestProjects.create_project(
                 "large_project",
@@ -1077,14 +1067,14 @@ class TestRunner:
 
             # Load it (should replace one of the existing projects due to MAX_PROJECTS)
             # First unload one
-            requests.post(
-                f"{TestConfig.SERVER_URL}/api/projects/unload",
-                json={'project_id': self.project_ids.get('B')},
+            self.session.post(
+                f"{self.base_url}/api/projects/unload",
+                json={'project_id': project_b},
                 timeout=TestConfig.API_TIMEOUT
             )
 
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/load-project",
+            response = self.session.post(
+                f"{self.base_url}/api/load-project",
                 json={'path': large_project_path},
                 timeout=TestConfig.API_TIMEOUT
             )
@@ -1093,10 +1083,10 @@ class TestRunner:
                 large_project_id = response.json().get('project_id')
 
                 # Try chat with huge context
-                response = requests.post(
-                    f"{TestConfig.SERVER_URL}/api/chat",
+                response = self.session.post(
+                    chat_url,
                     json={
-                        'message': 'Analyze everything' * 100,  # Very long query
+                        'message': self._LONG_QUERY,
                         'project_id': large_project_id
                     },
                     timeout=TestConfig.API_TIMEOUT
@@ -1105,28 +1095,20 @@ class TestRunner:
                 if response.status_code == 200:
                     data = response.json()
                     # Context should be truncated
-                    passed = assert_less(data.get('context_size', 0), 35000, "Test 8.7: Context truncated")
+                    rec.passed = assert_less(data.get('context_size', 0), 35000, "Test 8.7: Context truncated")
                 else:
-                    passed = True  # Handled gracefully
+                    rec.passed = True  # Handled gracefully
             else:
-                passed = True  # Couldn't load, but that's ok for this test
-
-            self.record_test("8.7: Context overflow", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("8.7: Context overflow", False, time.time() - start, str(e))
+                rec.passed = True  # Couldn't load, but that's ok for this test
 
         # Test 8.8: Clear per-project history
-        start = time.time()
-        try:
-            response = requests.post(
-                f"{TestConfig.SERVER_URL}/api/chat/clear",
-                json={'project_id': self.project_ids.get('A')},
+        with self._test("8.8: Clear project history") as rec:
+            response = self.session.post(
+                f"{self.base_url}/api/chat/clear",
+                json={'project_id': project_a},
                 timeout=TestConfig.API_TIMEOUT
             )
-            passed = assert_status(response, 200, "Test 8.8: Clear per-project history")
-            self.record_test("8.8: Clear project history", passed, time.time() - start)
-        except Exception as e:
-            self.record_test("8.8: Clear project history", False, time.time() - start, str(e))
+            rec.passed = assert_status(response, 200, "Test 8.8: Clear per-project history")
 
     # ───────────────────────────────────────────────────────────────────
     # Reporting
@@ -1138,7 +1120,10 @@ class TestRunner:
         print("SUMMARY")
         print("=" * 60)
 
-        self.results['end_time'] = datetime.now().isoformat()
+        # One clock read for the end time, results filename and both markdown docs
+        now = datetime.now()
+        generated = now.isoformat()
+        self.results['end_time'] = generated
 
         print(f"Total Tests:  {self.results['total']}")
         print(f"Passed:       {self.results['passed']} ✓")
@@ -1153,24 +1138,28 @@ class TestRunner:
                         print(f"    Error: {test['error']}")
 
         # Save JSON results
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         results_file = TestConfig.RESULTS_DIR / f"test_results_{timestamp}.json"
-        results_file.write_text(json.dumps(self.results, indent=2))
+        # Write to a temp file and rename so an interrupted run never leaves a truncated file
+        tmp_file = results_file.with_suffix('.json.tmp')
+        tmp_file.write_text(json.dumps(self.results, indent=2))
+        os.replace(tmp_file, results_file)
         print(f"\nResults saved to: {results_file}")
 
         # Generate issues document
-        self.generate_issues_doc()
+        self.generate_issues_doc(generated)
 
         # Generate coverage document
-        self.generate_coverage_doc()
+        self.generate_coverage_doc(generated)
 
-    def generate_issues_doc(self):
+    def generate_issues_doc(self, generated=None):
         """Generate MULTI_PROJECT_ISSUES.md"""
         issues_file = TestConfig.RESULTS_DIR / "MULTI_PROJECT_ISSUES.md"
 
-        content = f"""# Multi-Project Chat - Test Issues
+        buf = io.StringIO()
+        buf.write(f"""# Multi-Project Chat - Test Issues
 
-Generated: {datetime.now().isoformat()}
+Generated: {generated or datetime.now().isoformat()}
 
 ## Summary
 
@@ -1179,10 +1168,10 @@ Generated: {datetime.now().isoformat()}
 - Failed: {self.results['failed']}
 - API Key Available: {'Yes ✓' if HAS_API_KEY else 'No (some tests skipped)'}
 
-"""
+""")
 
         if not HAS_API_KEY:
-            content += """## ℹ️  Note on Test Results
+            buf.write("""## ℹ️  Note on Test Results
 
 **DEEPSEEK_API_KEY is not set.** Tests that require actual API calls were skipped or failed gracefully.
 
@@ -1202,10 +1191,10 @@ The following tests require an API key:
 
 ---
 
-"""
+""")
 
         if self.results['failed'] > 0:
-            content += "## Issues Found\n\n"
+            buf.write("## Issues Found\n\n")
 
             api_failures = []
             other_failures = []
@@ -1218,47 +1207,48 @@ The following tests require an API key:
                     other_failures.append(issue)
 
             if api_failures and not HAS_API_KEY:
-                content += "### Expected Failures (No API Key)\n\n"
+                buf.write("### Expected Failures (No API Key)\n\n")
                 for issue in api_failures:
-                    content += f"- **{issue['test']}**: Expected (requires API key)\n"
-                content += "\n"
+                    buf.write(f"- **{issue['test']}**: Expected (requires API key)\n")
+                buf.write("\n")
 
             if other_failures:
-                content += "### Critical Issues (Requires Investigation)\n\n"
+                buf.write("### Critical Issues (Requires Investigation)\n\n")
                 for i, issue in enumerate(other_failures, 1):
-                    content += f"#### Issue {i}: {issue['test']}\n\n"
-                    content += f"**Error:** {issue['error']}\n\n"
-                    content += "**Recommended Fix:** Review implementation details\n\n"
+                    buf.write(f"#### Issue {i}: {issue['test']}\n\n")
+                    buf.write(f"**Error:** {issue['error']}\n\n")
+                    buf.write("**Recommended Fix:** Review implementation details\n\n")
             elif not other_failures and api_failures:
-                content += "### ✅ No Critical Issues\n\n"
-                content += "All failures are due to missing API key. Set DEEPSEEK_API_KEY to run full tests.\n\n"
+                buf.write("### ✅ No Critical Issues\n\n")
+                buf.write("All failures are due to missing API key. Set DEEPSEEK_API_KEY to run full tests.\n\n")
         else:
-            content += "## ✅ No Issues Found\n\nAll tests passed successfully!\n"
+            buf.write("## ✅ No Issues Found\n\nAll tests passed successfully!\n")
 
-        issues_file.write_text(content)
+        issues_file.write_text(buf.getvalue())
         print(f"Issues documented in: {issues_file}")
 
-    def generate_coverage_doc(self):
+    def generate_coverage_doc(self, generated=None):
         """Generate TEST_COVERAGE.md"""
         coverage_file = TestConfig.RESULTS_DIR / "TEST_COVERAGE.md"
 
-        content = f"""# Multi-Project Chat - Test Coverage
+        buf = io.StringIO()
+        buf.write(f"""# Multi-Project Chat - Test Coverage
 
-Generated: {datetime.now().isoformat()}
+Generated: {generated or datetime.now().isoformat()}
 
 ## Coverage Matrix
 
 | Group | Test | Status |
 |-------|------|--------|
-"""
+""")
 
         for test in self.results['tests']:
             status = "✓" if test['passed'] else "✗"
-            content += f"| {test['name'].split(':')[0]} | {test['name']} | {status} |\n"
+            buf.write(f"| {test['name'].split(':')[0]} | {test['name']} | {status} |\n")
 
-        content += f"\n## Coverage: {self.results['passed']}/{self.results['total']} ({int(self.results['passed']/self.results['total']*100)}%)\n"
+        buf.write(f"\n## Coverage: {self.results['passed']}/{self.results['total']} ({int(self.results['passed']/self.results['total']*100)}%)\n")
 
-        coverage_file.write_text(content)
+        coverage_file.write_text(buf.getvalue())
         print(f"Coverage documented in: {coverage_file}")
 
 
@@ -1285,7 +1275,7 @@ def main():
 
     try:
         # Run tests
-        runner = TestRunner()
+        runner = TestRunner(server.base_url)
 
         if args.group:
             print(f"Running test group {args.group} only...")
@@ -4,7 +4,6 @@ Quick verification script for DeepSeek optimizations
 """
 
 import sys
-sys.path.insert(0, '.')
 from cartographer import (
     MODEL_DEEPSEEK_CODER,
     MODEL_DEEPSEEK_REASONER,
@@ -18,6 +17,10 @@ from cartographer import (
     _select_relevant_files
 )
 
+# Token estimation inputs, built once at import
+_TEST_1K = "a" * 1000  # 1000 chars
+_TEST_10K = "a" * 10000  # 10,000 chars = ~2,500 tokens
+
 def test_model_constants():
     """Test that model constants are defined"""
     print("Testing model constants...")
@@ -51,13 +54,11 @@ def test_optimal_temps():
 def test_token_estimation():
     """Test token estimation utilities"""
     print("Testing token estimation...")
-    test_text = "a" * 1000  # 1000 chars
-    tokens = estimate_tokens(test_text)
+    tokens = estimate_tokens(_TEST_1K)
     assert tokens == 250, f"Expected 250 tokens, got {tokens}"
 
     # Test truncation
-    large_text = "a" * 10000  # 10,000 chars = ~2,500 tokens
-    truncated = _truncate_to_tokens(large_text, max_tokens=1000)
+    truncated = _truncate_to_tokens(_TEST_10K, max_tokens=1000)
     assert len(truncated) == 4000, f"Expected 4000 chars, got {len(truncated)}"
     print("  ✅ Token estimation working correctly")
 
@@ -4,6 +4,8 @@ Comprehensive Systems Test for Cartographer
 Tests all implementations with real HTTP calls and API integration
 """
 
+import io
+import re
 import json
 import time
 import sys
@@ -11,17 +13,22 @@ import os
 from datetime import datetime
 from typing import Dict, List, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from ui_enhancements import UIEnhancementRegistry, UIComponent, UIEnhancement
+from ui_enhancements import UIEnhancementRegistry, UIComponent, UIEnhancement, registry
 
 
 # ═══════════════════════════════════════════════════════════
 # TEST CONFIGURATION
 # ═══════════════════════════════════════════════════════════
 
+# Captured once at import; names the results file and stamps the report
+_RUN_STARTED = datetime.now()
+
+
 class TestConfig:
     """Test configuration"""
     CARTOGRAPHER_URL = "http://localhost:3001"  # Server is on port 3001
@@ -34,7 +41,16 @@ class TestConfig:
     errors = []
 
     # Test output file
-    results_file = f"test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+    results_file = f"test_results_{_RUN_STARTED.strftime('%Y%m%d_%H%M%S')}.md"
+
+    # Shared keep-alive connection pool for every HTTP probe
+    session = requests.Session()
+
+    # Set by test_server_connection; later suites skip when the server is down
+    server_up = False
+
+
+TestConfig.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0))
 
 
 # ═══════════════════════════════════════════════════════════
@@ -51,6 +67,10 @@ class Colors:
     END = '\033[0m'
 
 
+# Matches any SGR escape, so the file copy of the report is stripped in one pass
+_ANSI = re.compile(r'\x1b\[[0-9;]*m')
+
+
 def log_test(name: str):
     """Log test start"""
     print(f"\n{Colors.BLUE}{Colors.BOLD}▶ Testing: {name}{Colors.END}")
@@ -88,7 +108,8 @@ def test_ui_registry_initialization():
     log_test("UIEnhancementRegistry Initialization")
 
     try:
-        registry = UIEnhancementRegistry()
+        # Read-only checks run against the module's global instance; only the
+        # operations suite below needs a private registry it can mutate
 
         # Test: Registry created
         if registry:
@@ -104,7 +125,7 @@ def test_ui_registry_initialization():
             log_fail("No default enhancements loaded")
 
         # Test: All components have enhancements
-        components_with_enhancements = set(e.component for e in registry.enhancements)
+        components_with_enhancements = {e.component for e in registry.enhancements}
         if len(components_with_enhancements) >= 5:
             log_pass(f"Enhancements for {len(components_with_enhancements)} components")
         else:
@@ -174,13 +195,12 @@ def test_ui_registry_operations():
 
         # Test: Export to JSON
         try:
-            test_file = "test_export.json"
-            registry.export_to_json(test_file)
-            if os.path.exists(test_file):
+            buf = io.StringIO()
+            registry.export_to_json(buf)
+            if json.loads(buf.getvalue()).get("enhancements"):
                 log_pass("Export to JSON successful")
-                os.remove(test_file)
             else:
-                log_fail("Export to JSON failed - file not created")
+                log_fail("Export to JSON failed - no enhancements written")
         except Exception as e:
             log_fail("Export to JSON failed", str(e))
 
@@ -202,13 +222,17 @@ def test_server_connection():
     """Test connection to Cartographer server"""
     log_test("Server Connection")
 
+    TestConfig.server_up = False
     try:
-        response = requests.get(
+        # Liveness comes from the dashboard route; /api/scan gets its own
+        # check in test_api_endpoints, where a bad status is a failure there
+        response = TestConfig.session.get(
             f"{TestConfig.CARTOGRAPHER_URL}/",
             timeout=TestConfig.TIMEOUT
         )
+        TestConfig.server_up = response.status_code == 200
 
-        if response.status_code == 200:
+        if TestConfig.server_up:
             log_pass("Server is running and accessible")
         else:
             log_fail(f"Server returned status {response.status_code}")
@@ -223,9 +247,13 @@ def test_api_endpoints():
     """Test API endpoints"""
     log_test("API Endpoints")
 
+    if not TestConfig.server_up:
+        log_info("Server not reachable - skipping API endpoint tests")
+        return
+
     # Test: /api/scan endpoint
     try:
-        response = requests.get(
+        response = TestConfig.session.get(
             f"{TestConfig.CARTOGRAPHER_URL}/api/scan",
             timeout=TestConfig.TIMEOUT
         )
@@ -243,7 +271,7 @@ def test_api_endpoints():
 
     # Test: /api/project-root endpoint
     try:
-        response = requests.get(
+        response = TestConfig.session.get(
             f"{TestConfig.CARTOGRAPHER_URL}/api/project-root",
             timeout=TestConfig.TIMEOUT
         )
@@ -261,7 +289,7 @@ def test_api_endpoints():
 
     # Test: /api/agent-context endpoint
     try:
-        response = requests.get(
+        response = TestConfig.session.get(
             f"{TestConfig.CARTOGRAPHER_URL}/api/agent-context",
             timeout=TestConfig.TIMEOUT
         )
@@ -282,9 +310,13 @@ def test_api_post_endpoints():
     """Test POST API endpoints"""
     log_test("POST API Endpoints")
 
+    if not TestConfig.server_up:
+        log_info("Server not reachable - skipping POST endpoint tests")
+        return
+
     # Test: /api/read-file endpoint
     try:
-        response = requests.post(
+        response = TestConfig.session.post(
             f"{TestConfig.CARTOGRAPHER_URL}/api/read-file",
             json={"path": "README.md"},
             timeout=TestConfig.TIMEOUT
@@ -305,7 +337,7 @@ def test_api_post_endpoints():
 
     # Test: /api/glob-files endpoint
     try:
-        response = requests.post(
+        response = TestConfig.session.post(
             f"{TestConfig.CARTOGRAPHER_URL}/api/glob-files",
             json={"pattern": "*.py"},
             timeout=TestConfig.TIMEOUT
@@ -324,7 +356,7 @@ def test_api_post_endpoints():
 
     # Test: /api/exec-command endpoint
     try:
-        response = requests.post(
+        response = TestConfig.session.post(
             f"{TestConfig.CARTOGRAPHER_URL}/api/exec-command",
             json={"command": "echo 'test'"},
             timeout=TestConfig.TIMEOUT
@@ -346,6 +378,10 @@ def test_chat_endpoints():
     """Test chat-related endpoints"""
     log_test("Chat Endpoints")
 
+    if not TestConfig.server_up:
+        log_info("Server not reachable - skipping chat tests")
+        return
+
     # Check if API key is set
     if not TestConfig.DEEPSEEK_API_KEY:
         log_info("DEEPSEEK_API_KEY not set - skipping chat tests")
@@ -353,7 +389,7 @@ def test_chat_endpoints():
 
     # Test: /api/chat endpoint
     try:
-        response = requests.post(
+        response = TestConfig.session.post(
             f"{TestConfig.CARTOGRAPHER_URL}/api/chat",
             json={
                 "message": "What files are in this project?",
@@ -384,7 +420,7 @@ def test_chat_endpoints():
 
     # Test: /api/chat/history endpoint
     try:
-        response = requests.get(
+        response = TestConfig.session.get(
             f"{TestConfig.CARTOGRAPHER_URL}/api/chat/history",
             timeout=TestConfig.TIMEOUT
         )
@@ -419,9 +455,13 @@ def test_end_to_end_workflow():
     """Test complete workflow"""
     log_test("End-to-End Workflow")
 
+    if not TestConfig.server_up:
+        log_info("Server not reachable - skipping end-to-end workflow")
+        return
+
     try:
         # Step 1: Check server
-        response = requests.get(f"{TestConfig.CARTOGRAPHER_URL}/api/scan", timeout=10)
+        response = TestConfig.session.get(f"{TestConfig.CARTOGRAPHER_URL}/api/scan", timeout=10)
         if response.status_code != 200:
             log_fail("Server not ready for E2E test")
             return
@@ -429,7 +469,7 @@ def test_end_to_end_workflow():
         log_pass("Step 1: Server accessible")
 
         # Step 2: Get project info
-        response = requests.get(f"{TestConfig.CARTOGRAPHER_URL}/api/project-root", timeout=10)
+        response = TestConfig.session.get(f"{TestConfig.CARTOGRAPHER_URL}/api/project-root", timeout=10)
         if response.status_code == 200:
             project_data = response.json()
             log_pass(f"Step 2: Project loaded - {project_data.get('project_root', 'unknown')}")
@@ -438,7 +478,7 @@ def test_end_to_end_workflow():
             return
 
         # Step 3: Search for files
-        response = requests.post(
+        response = TestConfig.session.post(
             f"{TestConfig.CARTOGRAPHER_URL}/api/glob-files",
             json={"pattern": "*.py"},
             timeout=10
@@ -451,7 +491,7 @@ def test_end_to_end_workflow():
             return
 
         # Step 4: Get risk map
-        response = requests.get(f"{TestConfig.CARTOGRAPHER_URL}/api/agent-context", timeout=10)
+        response = TestConfig.session.get(f"{TestConfig.CARTOGRAPHER_URL}/api/agent-context", timeout=10)
         if response.status_code == 200:
             log_pass("Step 4: Retrieved risk map")
         else:
@@ -459,7 +499,6 @@ def test_end_to_end_workflow():
             return
 
         # Step 5: UI Enhancement
-        from ui_enhancements import registry, UIComponent
         enhancements = registry.get_enhancements_for_component(UIComponent.CHAT_INTERFACE)
         if len(enhancements) > 0:
             log_pass(f"Step 5: Retrieved {len(enhancements)} UI enhancements")
@@ -481,8 +520,8 @@ def generate_report():
     total = TestConfig.passed + TestConfig.failed
     pass_rate = (TestConfig.passed / total * 100) if total > 0 else 0
 
-    report = f"""# Cartographer Systems Test Report
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    parts = [f"""# Cartographer Systems Test Report
+Generated: {_RUN_STARTED.strftime('%Y-%m-%d %H:%M:%S')}
 
 ## Summary
 - **Total Tests**: {total}
@@ -491,62 +530,62 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 - **Pass Rate**: {pass_rate:.1f}%
 
 ## Status
-"""
+"""]
 
     if TestConfig.failed == 0:
-        report += f"{Colors.GREEN}{Colors.BOLD}✓ ALL TESTS PASSED{Colors.END}\n\n"
+        parts.append(f"{Colors.GREEN}{Colors.BOLD}✓ ALL TESTS PASSED{Colors.END}\n\n")
     else:
-        report += f"{Colors.RED}{Colors.BOLD}✗ {TestConfig.failed} TEST(S) FAILED{Colors.END}\n\n"
+        parts.append(f"{Colors.RED}{Colors.BOLD}✗ {TestConfig.failed} TEST(S) FAILED{Colors.END}\n\n")
 
     if TestConfig.errors:
-        report += "## Failures & Fixes\n\n"
+        parts.append("## Failures & Fixes\n\n")
         for i, error in enumerate(TestConfig.errors, 1):
-            report += f"### {i}. {error}\n\n"
-            report += get_fix_suggestion(error)
-            report += "\n---\n\n"
+            parts.append(f"### {i}. {error}\n\n")
+            parts.append(get_fix_suggestion(error))
+            parts.append("\n---\n\n")
+    report = "".join(parts)
 
     # Write to file
     with open(TestConfig.results_file, 'w') as f:
         # Remove color codes for file
-        clean_report = report
-        for color in [Colors.GREEN, Colors.RED, Colors.YELLOW, Colors.BLUE, Colors.BOLD, Colors.END]:
-            clean_report = clean_report.replace(color, '')
-        f.write(clean_report)
+        f.write(_ANSI.sub('', report))
 
     return report
 
 
-def get_fix_suggestion(error: str) -> str:
-    """Get fix suggestion for error"""
-    suggestions = {
-        "Cannot connect to server": """
+# Checked in order; the first key found in the error message wins
+_FIX_SUGGESTIONS = {
+    "Cannot connect to server": """
 **Fix:**
 ```bash
 # Start Cartographer server
 python3 cartographer.py /path/to/your/project
 ```
 """,
-        "API key": """
+    "API key": """
 **Fix:**
 ```bash
 # Set DeepSeek API key
 export DEEPSEEK_API_KEY='your-api-key-here'
 ```
 """,
-        "import": """
+    "import": """
 **Fix:**
 Check that all dependencies are installed:
 ```bash
 pip install requests mcp fastmcp
 ```
 """,
-        "404": """
+    "404": """
 **Fix:**
 Ensure the Cartographer server is running with a project loaded.
 """,
-    }
+}
+
 
-    for key, suggestion in suggestions.items():
+def get_fix_suggestion(error: str) -> str:
+    """Get fix suggestion for error"""
+    for key, suggestion in _FIX_SUGGESTIONS.items():
         if key in error:
             return suggestion
 
@@ -568,20 +607,23 @@ def run_all_tests():
     print(f"  API Key: {'✓ Set' if TestConfig.DEEPSEEK_API_KEY else '✗ Not Set'}")
     print(f"  Results: {TestConfig.results_file}")
 
-    # Run test suites
-    test_ui_registry_initialization()
-    test_ui_registry_operations()
-    test_server_connection()
-    test_api_endpoints()
-    test_api_post_endpoints()
-    test_chat_endpoints()
-    test_end_to_end_workflow()
-
-    # Generate report
-    print(f"\n{Colors.BOLD}{'='*70}{Colors.END}")
-    report = generate_report()
-    print(report)
-    print(f"{Colors.BOLD}{'='*70}{Colors.END}\n")
+    try:
+        # Run test suites
+        test_ui_registry_initialization()
+        test_ui_registry_operations()
+        test_server_connection()
+        test_api_endpoints()
+        test_api_post_endpoints()
+        test_chat_endpoints()
+        test_end_to_end_workflow()
+
+        # Generate report
+        print(f"\n{Colors.BOLD}{'='*70}{Colors.END}")
+        report = generate_report()
+        print(report)
+        print(f"{Colors.BOLD}{'='*70}{Colors.END}\n")
+    finally:
+        TestConfig.session.close()
 
     print(f"📄 Full report saved to: {Colors.BLUE}{TestConfig.results_file}{Colors.END}\n")
 
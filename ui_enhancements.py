@@ -5,7 +5,7 @@ Provides reusable UI enhancement patterns for chat-driven optimization
 """
 
 from enum import Enum
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, TextIO, Union
 from dataclasses import dataclass
 import json
 
@@ -23,7 +23,7 @@ class UIComponent(Enum):
     CONCERNS_VIEW = "concerns_view"
 
 
-@dataclass
+@dataclass(slots=True)
 class UIEnhancement:
     """Represents a single UI enhancement"""
     component: UIComponent
@@ -272,20 +272,25 @@ function highlightDependencyChain(nodeId, graphData, direction = 'both') {
     const visited = new Set();
     const edges = new Set();
 
+    // Build adjacency once so each traversal step is O(degree), not O(E)
+    const outgoing = new Map();
+    const incoming = new Map();
+    graphData.edges.forEach(edge => {
+        if (!outgoing.has(edge.source)) outgoing.set(edge.source, []);
+        if (!incoming.has(edge.target)) incoming.set(edge.target, []);
+        outgoing.get(edge.source).push(edge);
+        incoming.get(edge.target).push(edge);
+    });
+
     function traverse(currentId, isForward) {
         if (visited.has(currentId)) return;
         visited.add(currentId);
 
-        graphData.edges.forEach(edge => {
-            const isRelevant = isForward
-                ? edge.source === currentId
-                : edge.target === currentId;
-
-            if (isRelevant) {
-                edges.add(edge.id);
-                const nextId = isForward ? edge.target : edge.source;
-                traverse(nextId, isForward);
-            }
+        const adj = isForward ? outgoing : incoming;
+        (adj.get(currentId) || []).forEach(edge => {
+            edges.add(edge.id);
+            const nextId = isForward ? edge.target : edge.source;
+            traverse(nextId, isForward);
         });
     }
 
@@ -464,22 +469,44 @@ function applySuggestion(suggestion) {
                 description="Fuzzy search with scoring and highlighting",
                 implementation="""
 function enableFuzzyFileSearch(fileTree, searchInput) {
+    // Lowered path plus a character bitmap per file. A query can only match
+    // files whose bitmap covers every query character, so most files are
+    // rejected with a single AND before any scanning.
+    const items = fileTree.getElementsByClassName('file-item');  // live collection
+    let index = [];
+
+    // Rebuilt on the first input after each tree load: a re-render changes the
+    // item count or detaches the nodes the index points at
+    function currentIndex() {
+        const stale = index.length !== items.length || (index.length > 0 &&
+            (!index[0].file.isConnected || !index[index.length - 1].file.isConnected));
+        if (stale) {
+            index = Array.from(items).map(file => {
+                const path = file.getAttribute('data-path').toLowerCase();
+                return {file, path, mask: charMask(path)};
+            });
+        }
+        return index;
+    }
+
     searchInput.addEventListener('input', (e) => {
         const query = e.target.value.toLowerCase();
-        const files = Array.from(fileTree.querySelectorAll('.file-item'));
+        const entries = currentIndex();
 
         if (!query) {
-            files.forEach(f => {
-                f.style.display = '';
-                f.style.opacity = '1';
+            entries.forEach(({file}) => {
+                file.style.display = '';
+                file.style.opacity = '1';
             });
             return;
         }
 
-        const scored = files.map(file => {
-            const path = file.getAttribute('data-path').toLowerCase();
-            const score = fuzzyMatchScore(query, path);
-            return {file, score, path};
+        const queryMask = charMask(query);
+        const scored = entries.map(entry => {
+            const score = (entry.mask & queryMask) === queryMask
+                ? fuzzyMatchScore(query, entry.path)
+                : 0;
+            return {...entry, score};
         });
 
         scored.sort((a, b) => b.score - a.score);
@@ -498,6 +525,18 @@ function enableFuzzyFileSearch(fileTree, searchInput) {
     });
 }
 
+function charMask(text) {
+    // One bit per a-z / 0-9 bucket (folded into 32 bits); other chars share bit 31
+    let mask = 0;
+    for (let i = 0; i < text.length; i++) {
+        const c = text.charCodeAt(i);
+        if (c >= 97 && c <= 122) mask |= 1 << (c - 97);
+        else if (c >= 48 && c <= 57) mask |= 1 << (26 + (c - 48) % 5);
+        else mask |= 1 << 31;
+    }
+    return mask;
+}
+
 function fuzzyMatchScore(query, text) {
     let score = 0;
     let queryIndex = 0;
@@ -602,14 +641,18 @@ function formatFileSize(bytes) {
         enhancements.sort(key=lambda x: x.priority)
         return [e.apply(context or {}) for e in enhancements]
 
-    def export_to_json(self, filepath: str):
-        """Export all enhancements to JSON file"""
+    def export_to_json(self, filepath: Union[str, TextIO], indent: Optional[int] = None):
+        """Export all enhancements as JSON to a path or text stream; compact unless indent is given"""
         data = {
             "version": "1.0",
             "enhancements": [e.to_dict() for e in self.enhancements]
         }
+        separators = (',', ':') if indent is None else None
+        if hasattr(filepath, 'write'):
+            json.dump(data, filepath, indent=indent, separators=separators)
+            return
         with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, indent=indent, separators=separators)
 
     def list_all(self) -> str:
         """List all enhancements in human-readable format"""
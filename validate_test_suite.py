@@ -1,15 +1,73 @@
 #!/usr/bin/env python3
 """
 Quick validation for test_deepseek_system.py
-Verifies structure and imports without running full tests
+Verifies structure and imports without running (or importing) the tests
 """
 
+import ast
+import os
 import sys
 import importlib.util
 from pathlib import Path
 
-def validate_test_structure():
-    """Validate test file structure"""
+# Names the DeepSeek suite must define; tuples keep display order and the
+# frozensets are what each section diffs against
+_CLASSES = (
+    'TestConfig',
+    'DeepSeekTestRunner',
+    'TestProjectGenerator',
+    'TestSuite',
+)
+
+_TEST_METHODS = (
+    'test_1_1_default_model_is_coder',
+    'test_1_2_model_switching',
+    'test_1_3_model_persistence',
+    'test_2_1_token_estimation',
+    'test_2_2_token_truncation',
+    'test_2_3_context_size_increased',
+    'test_2_4_token_limits_per_model',
+    'test_3_1_query_in_response',
+    'test_3_2_focus_extraction',
+    'test_3_3_explicitly_requested_files',
+    'test_4_1_relevance_prioritizes_auth',
+    'test_4_2_high_risk_files_boosted',
+    'test_4_3_recent_changes_boost',
+    'test_5_1_chat_with_deepseek_coder',
+    'test_5_2_chat_history_accumulation',
+    'test_5_3_structured_json_output',
+    'test_6_1_coder_provides_file_paths',
+    'test_6_2_reasoner_model_response',
+    'test_6_3_chat_model_conversational',
+    'test_7_1_invalid_model_name',
+    'test_7_2_missing_message',
+    'test_7_3_invalid_project_id',
+    'setup',
+    'generate_report',
+)
+
+_HELPERS = (
+    'print_test',
+    'assert_status',
+    'assert_contains',
+    'assert_equal',
+    'assert_greater',
+    'assert_less',
+    'assert_in_list',
+)
+
+_CLASS_SET = frozenset(_CLASSES)
+_TEST_METHOD_SET = frozenset(_TEST_METHODS)
+_HELPER_SET = frozenset(_HELPERS)
+
+
+def _method_names(class_node):
+    """Names of the functions defined directly in a class body"""
+    return {node.name for node in class_node.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))}
+
+def validate_test_structure(quick=False):
+    """Validate test file structure; quick=True skips the per-name listing"""
     print("\n🔍 Validating DeepSeek Test Suite Structure\n")
     print("="*60)
 
@@ -22,101 +80,81 @@ def validate_test_structure():
 
     print("✅ Test file exists")
 
-    # Load module
+    # Parse module (names are checked from the AST, nothing is executed)
     try:
-        spec = importlib.util.spec_from_file_location("test_deepseek_system", test_file)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        print("✅ Module loads successfully")
-    except Exception as e:
-        print(f"❌ Failed to load module: {e}")
+        tree = ast.parse(test_file.read_text(), filename=str(test_file))
+        print("✅ Module parses successfully")
+    except SyntaxError as e:
+        print(f"❌ Failed to parse module: {e}")
         return False
 
-    # Check classes exist
-    classes_to_check = [
-        'TestConfig',
-        'DeepSeekTestRunner',
-        'TestProjectGenerator',
-        'TestSuite'
-    ]
-
-    for class_name in classes_to_check:
-        if hasattr(module, class_name):
-            print(f"✅ Class '{class_name}' exists")
-        else:
-            print(f"❌ Class '{class_name}' missing")
-            return False
+    # Top-level imports must be resolvable without importing them
+    sys.path.insert(0, str(test_file.parent))
+    imported = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imported.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            imported.add(node.module.split('.')[0])
+    unresolved = sorted(name for name in imported if importlib.util.find_spec(name) is None)
+    if unresolved:
+        print(f"❌ Unresolved imports: {', '.join(unresolved)}")
+        return False
+    print(f"✅ All {len(imported)} imports resolve")
+
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    functions = {node.name for node in tree.body
+                 if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))}
+
+    # Quick mode: pass/fail only, stopping at the first section that fails
+    if quick:
+        ok = (_CLASS_SET <= classes.keys()
+              and _TEST_METHOD_SET <= _method_names(classes['TestSuite'])
+              and _HELPER_SET <= functions)
+        print("✅ ALL VALIDATION CHECKS PASSED" if ok else "❌ Validation failed (rerun without --fast for details)")
+        return ok
+
+    # Check classes exist (each section is one set difference, reported with a single print)
+    missing_classes = _CLASS_SET - classes.keys()
+    print("\n".join(
+        f"❌ Class '{name}' missing" if name in missing_classes else f"✅ Class '{name}' exists"
+        for name in _CLASSES
+    ))
+    if missing_classes:
+        return False
 
     # Check TestSuite has all test methods
-    test_suite = module.TestSuite
-    test_methods = [
-        'test_1_1_default_model_is_coder',
-        'test_1_2_model_switching',
-        'test_1_3_model_persistence',
-        'test_2_1_token_estimation',
-        'test_2_2_token_truncation',
-        'test_2_3_context_size_increased',
-        'test_2_4_token_limits_per_model',
-        'test_3_1_query_in_response',
-        'test_3_2_focus_extraction',
-        'test_3_3_explicitly_requested_files',
-        'test_4_1_relevance_prioritizes_auth',
-        'test_4_2_high_risk_files_boosted',
-        'test_4_3_recent_changes_boost',
-        'test_5_1_chat_with_deepseek_coder',
-        'test_5_2_chat_history_accumulation',
-        'test_5_3_structured_json_output',
-        'test_6_1_coder_provides_file_paths',
-        'test_6_2_reasoner_model_response',
-        'test_6_3_chat_model_conversational',
-        'test_7_1_invalid_model_name',
-        'test_7_2_missing_message',
-        'test_7_3_invalid_project_id',
-        'setup',
-        'generate_report'
-    ]
-
-    print(f"\n📋 Checking {len(test_methods)} test methods...")
-    missing_methods = []
-    for method_name in test_methods:
-        if hasattr(test_suite, method_name):
-            print(f"  ✅ {method_name}")
-        else:
-            print(f"  ❌ {method_name}")
-            missing_methods.append(method_name)
+    test_suite = _method_names(classes['TestSuite'])
+    missing_methods = _TEST_METHOD_SET - test_suite
+    print(f"\n📋 Checking {len(_TEST_METHODS)} test methods...")
+    print("\n".join(
+        f"  ❌ {name}" if name in missing_methods else f"  ✅ {name}"
+        for name in _TEST_METHODS
+    ))
 
     if missing_methods:
-        print(f"\n❌ Missing methods: {', '.join(missing_methods)}")
+        print(f"\n❌ Missing methods: {', '.join(m for m in _TEST_METHODS if m in missing_methods)}")
         return False
 
     # Check helper functions exist
-    helper_functions = [
-        'print_test',
-        'assert_status',
-        'assert_contains',
-        'assert_equal',
-        'assert_greater',
-        'assert_less',
-        'assert_in_list'
-    ]
-
-    print(f"\n🛠️  Checking {len(helper_functions)} helper functions...")
-    for func_name in helper_functions:
-        if hasattr(module, func_name):
-            print(f"  ✅ {func_name}")
-        else:
-            print(f"  ❌ {func_name}")
-            return False
+    missing_helpers = _HELPER_SET - functions
+    print(f"\n🛠️  Checking {len(_HELPERS)} helper functions...")
+    print("\n".join(
+        f"  ❌ {name}" if name in missing_helpers else f"  ✅ {name}"
+        for name in _HELPERS
+    ))
+    if missing_helpers:
+        return False
 
     # Summary
     print("\n" + "="*60)
     print("✅ ALL VALIDATION CHECKS PASSED")
     print("="*60)
     print("\n📊 Test Suite Statistics:")
-    print(f"  • Total test methods: {len([m for m in test_methods if m.startswith('test_')])}")
+    print(f"  • Total test methods: {len([m for m in _TEST_METHODS if m.startswith('test_')])}")
     print(f"  • Test phases: 7")
-    print(f"  • Helper functions: {len(helper_functions)}")
-    print(f"  • Classes: {len(classes_to_check)}")
+    print(f"  • Helper functions: {len(_HELPERS)}")
+    print(f"  • Classes: {len(_CLASSES)}")
 
     print("\n🚀 Ready to run:")
     print("  python3 test_deepseek_system.py")
@@ -127,5 +165,6 @@ def validate_test_structure():
     return True
 
 if __name__ == '__main__':
-    success = validate_test_structure()
+    quick = '--fast' in sys.argv or os.environ.get('QUICK_VALIDATE') == '1'
+    success = validate_test_structure(quick=quick)
     sys.exit(0 if success else 1)